@@ -0,0 +1,35 @@
+# bash completion for mqtt-llm
+_mqtt_llm() {
+    local cur="${COMP_WORDS[COMP_CWORD]}"
+    local prev="${COMP_WORDS[COMP_CWORD-1]}"
+    case "$prev" in
+        --mqtt-broker) return ;;
+        --mqtt-port) return ;;
+        --mqtt-username) return ;;
+        --mqtt-password) return ;;
+        --mqtt-client-id) return ;;
+        --mqtt-subscribe-topic) return ;;
+        --mqtt-subscribe-path) return ;;
+        --mqtt-publish-topic) return ;;
+        --mqtt-publish-template) return ;;
+        --mqtt-qos) return ;;
+        --mqtt-trigger-pattern) return ;;
+        --mqtt-tls-ca-certs) COMPREPLY=($(compgen -f -- "$cur")); return ;;
+        --mqtt-tls-certfile) COMPREPLY=($(compgen -f -- "$cur")); return ;;
+        --mqtt-tls-keyfile) COMPREPLY=($(compgen -f -- "$cur")); return ;;
+        --mqtt-message-max-length) return ;;
+        --openai-api-url) return ;;
+        --openai-api-key) return ;;
+        --openai-model) return ;;
+        --openai-system-prompt) return ;;
+        --openai-timeout) return ;;
+        --openai-max-tokens) return ;;
+        --openai-temperature) return ;;
+        --openai-max-concurrency) return ;;
+        --openai-cache-max-entries) return ;;
+        --openai-cache-ttl) return ;;
+        --log-level) COMPREPLY=($(compgen -W "DEBUG INFO WARNING ERROR CRITICAL" -- "$cur")); return ;;
+    esac
+    COMPREPLY=($(compgen -W "--mqtt-broker --mqtt-port --mqtt-username --mqtt-password --mqtt-client-id --mqtt-subscribe-topic --mqtt-subscribe-path --mqtt-publish-topic --mqtt-publish-template --mqtt-qos --mqtt-retain --no-mqtt-retain --mqtt-sanitize-response --no-mqtt-sanitize-response --mqtt-trigger-pattern --mqtt-use-tls --no-mqtt-use-tls --mqtt-tls-ca-certs --mqtt-tls-certfile --mqtt-tls-keyfile --mqtt-tls-insecure --no-mqtt-tls-insecure --mqtt-message-max-length --mqtt-stream-response --no-mqtt-stream-response --openai-api-url --openai-api-key --openai-model --openai-system-prompt --openai-timeout --openai-max-tokens --openai-temperature --openai-max-concurrency --openai-skip-health-check --no-openai-skip-health-check --openai-warm-up-model --no-openai-warm-up-model --openai-cache-max-entries --openai-cache-ttl --log-level --dry-run --help" -- "$cur"))
+}
+complete -o default -F _mqtt_llm mqtt-llm
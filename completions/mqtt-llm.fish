@@ -0,0 +1,43 @@
+# fish completion for mqtt-llm
+complete -c mqtt-llm -l mqtt-broker -d 'MQTT broker address' -x
+complete -c mqtt-llm -l mqtt-port -d 'MQTT broker port' -x
+complete -c mqtt-llm -l mqtt-username -d 'MQTT username for authentication' -x
+complete -c mqtt-llm -l mqtt-password -d 'MQTT password for authentication' -x
+complete -c mqtt-llm -l mqtt-client-id -d 'MQTT client ID' -x
+complete -c mqtt-llm -l mqtt-subscribe-topic -d 'MQTT topic to subscribe to for incoming messages' -x
+complete -c mqtt-llm -l mqtt-subscribe-path -d 'JSONPath expression to extract text from incoming messages' -x
+complete -c mqtt-llm -l mqtt-publish-topic -d 'MQTT topic to publish LLM responses to' -x
+complete -c mqtt-llm -l mqtt-publish-template -d 'Template for formatting response messages' -x
+complete -c mqtt-llm -l mqtt-qos -d 'MQTT Quality of Service level: 0=at most once, 1=at least once, 2=exactly once' -x
+complete -c mqtt-llm -l mqtt-retain -d 'Whether to retain MQTT messages'
+complete -c mqtt-llm -l no-mqtt-retain -d 'Whether to retain MQTT messages'
+complete -c mqtt-llm -l mqtt-sanitize-response -d 'Remove formatting, newlines, unicode, emojis from LLM responses'
+complete -c mqtt-llm -l no-mqtt-sanitize-response -d 'Remove formatting, newlines, unicode, emojis from LLM responses'
+complete -c mqtt-llm -l mqtt-trigger-pattern -d 'Regex pattern that must be present in message to trigger AI call' -x
+complete -c mqtt-llm -l mqtt-use-tls -d 'Enable TLS/SSL for MQTT connection'
+complete -c mqtt-llm -l no-mqtt-use-tls -d 'Enable TLS/SSL for MQTT connection'
+complete -c mqtt-llm -l mqtt-tls-ca-certs -d 'Path to CA certificates file for TLS validation' -r -F
+complete -c mqtt-llm -l mqtt-tls-certfile -d 'Path to client certificate file for TLS authentication' -r -F
+complete -c mqtt-llm -l mqtt-tls-keyfile -d 'Path to client private key file for TLS authentication' -r -F
+complete -c mqtt-llm -l mqtt-tls-insecure -d 'Skip certificate verification for TLS'
+complete -c mqtt-llm -l no-mqtt-tls-insecure -d 'Skip certificate verification for TLS'
+complete -c mqtt-llm -l mqtt-message-max-length -d 'Maximum message length in characters' -x
+complete -c mqtt-llm -l mqtt-stream-response -d 'Publish partial responses while the LLM is still generating'
+complete -c mqtt-llm -l no-mqtt-stream-response -d 'Publish partial responses while the LLM is still generating'
+complete -c mqtt-llm -l openai-api-url -d 'OpenAI-compatible API base URL' -x
+complete -c mqtt-llm -l openai-api-key -d 'API key for authentication' -x
+complete -c mqtt-llm -l openai-model -d 'Model name to use' -x
+complete -c mqtt-llm -l openai-system-prompt -d 'System prompt to guide the LLM behavior' -x
+complete -c mqtt-llm -l openai-timeout -d 'Timeout for API requests in seconds' -x
+complete -c mqtt-llm -l openai-max-tokens -d 'Maximum number of tokens to generate in response' -x
+complete -c mqtt-llm -l openai-temperature -d 'Sampling temperature' -x
+complete -c mqtt-llm -l openai-max-concurrency -d 'Maximum number of API requests in flight at once' -x
+complete -c mqtt-llm -l openai-skip-health-check -d 'Skip health check on startup'
+complete -c mqtt-llm -l no-openai-skip-health-check -d 'Skip health check on startup'
+complete -c mqtt-llm -l openai-warm-up-model -d 'Load the model with a one-token request on startup so the first reply is not delayed'
+complete -c mqtt-llm -l no-openai-warm-up-model -d 'Load the model with a one-token request on startup so the first reply is not delayed'
+complete -c mqtt-llm -l openai-cache-max-entries -d 'Number of responses to cache for repeated prompts' -x
+complete -c mqtt-llm -l openai-cache-ttl -d 'Seconds a cached response is reused' -x
+complete -c mqtt-llm -l log-level -d 'Application logging level' -x -a 'DEBUG INFO WARNING ERROR CRITICAL'
+complete -c mqtt-llm -l dry-run -d 'Validate configuration and display settings without starting the bridge'
+complete -c mqtt-llm -l help -d 'Show this message and exit'
@@ -0,0 +1,161 @@
+"""Generate static shell completion scripts for the mqtt-llm command.
+
+Click's built-in completion re-runs the CLI on every TAB press. These
+scripts are generated once from the option definitions instead, so the
+shell never starts Python to complete an option.
+
+Usage: python scripts/generate_completions.py [output_dir]
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+from mqtt_llm.cli import main as cli
+
+PROG = "mqtt-llm"
+FUNC = "_mqtt_llm"
+
+# Options whose values are paths on the local filesystem
+PATH_OPTIONS = {
+    "--mqtt-tls-ca-certs",
+    "--mqtt-tls-certfile",
+    "--mqtt-tls-keyfile",
+}
+
+
+def _options() -> List[click.Option]:
+    """Return the CLI options, including the implicit --help."""
+    ctx = click.Context(cli, info_name=PROG)
+    return [p for p in cli.get_params(ctx) if isinstance(p, click.Option)]
+
+
+def _flags(option: click.Option) -> List[str]:
+    """Return every long flag for an option, including --no-* forms."""
+    return [*option.opts, *option.secondary_opts]
+
+
+def _choices(option: click.Option) -> Optional[List[str]]:
+    """Return the allowed values for a Choice option."""
+    if isinstance(option.type, click.Choice):
+        return [str(choice) for choice in option.type.choices]
+    return None
+
+
+def _summary(option: click.Option) -> str:
+    """Return the first clause of an option's help text."""
+    text = option.help or ""
+    for separator in (" (", ". "):
+        text = text.split(separator, 1)[0]
+    return text.rstrip(".")
+
+
+def _takes_value(option: click.Option) -> bool:
+    """Return True when the option expects an argument."""
+    return not (option.is_flag or option.count)
+
+
+def bash() -> str:
+    """Build the bash completion script."""
+    words = " ".join(f for o in _options() for f in _flags(o))
+    cases = []
+    for option in _options():
+        if not _takes_value(option):
+            continue
+        flags = "|".join(option.opts)
+        choices = _choices(option)
+        if choices:
+            reply = f'compgen -W "{" ".join(choices)}" -- "$cur"'
+        elif option.opts[0] in PATH_OPTIONS:
+            reply = 'compgen -f -- "$cur"'
+        else:
+            reply = None
+        if reply:
+            cases.append(f"        {flags}) COMPREPLY=($({reply})); return ;;")
+        else:
+            cases.append(f"        {flags}) return ;;")
+
+    return "\n".join(
+        [
+            f"# bash completion for {PROG}",
+            f"{FUNC}() {{",
+            '    local cur="${COMP_WORDS[COMP_CWORD]}"',
+            '    local prev="${COMP_WORDS[COMP_CWORD-1]}"',
+            '    case "$prev" in',
+            *cases,
+            "    esac",
+            f'    COMPREPLY=($(compgen -W "{words}" -- "$cur"))',
+            "}",
+            f"complete -o default -F {FUNC} {PROG}",
+            "",
+        ]
+    )
+
+
+def zsh() -> str:
+    """Build the zsh completion script."""
+
+    def escape(text: str) -> str:
+        for char in "\\[]:'":
+            text = text.replace(char, "\\" + char)
+        return text
+
+    specs = []
+    for option in _options():
+        for flag in _flags(option):
+            spec = f"{flag}[{escape(_summary(option))}]"
+            if _takes_value(option):
+                choices = _choices(option)
+                if choices:
+                    spec += f":value:({' '.join(choices)})"
+                elif flag in PATH_OPTIONS:
+                    spec += ":path:_files"
+                else:
+                    spec += ":value: "
+            specs.append(f"    '{spec}'")
+
+    return "\n".join(
+        [
+            f"#compdef {PROG}",
+            "",
+            "_arguments \\",
+            " \\\n".join(specs),
+            "",
+        ]
+    )
+
+
+def fish() -> str:
+    """Build the fish completion script."""
+    lines = [f"# fish completion for {PROG}"]
+    for option in _options():
+        description = _summary(option).replace("'", "\\'")
+        for flag in _flags(option):
+            line = f"complete -c {PROG} -l {flag[2:]} -d '{description}'"
+            if _takes_value(option):
+                choices = _choices(option)
+                if choices:
+                    line += f" -x -a '{' '.join(choices)}'"
+                elif flag in PATH_OPTIONS:
+                    line += " -r -F"
+                else:
+                    line += " -x"
+            lines.append(line)
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Write the completion scripts to the output directory."""
+    output = Path(sys.argv[1] if len(sys.argv) > 1 else "completions")
+    output.mkdir(parents=True, exist_ok=True)
+    (output / f"{PROG}.bash").write_text(bash())
+    (output / f"_{PROG}").write_text(zsh())
+    (output / f"{PROG}.fish").write_text(fish())
+    print(f"Wrote completion scripts to {output}")
+
+
+if __name__ == "__main__":
+    main()
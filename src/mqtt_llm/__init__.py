@@ -1,17 +1,46 @@
 """MQTT to OpenAI-compatible API bridge application."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.1.0"
 
-from .bridge import MQTTLLMBridge
-from .config import AppConfig, MQTTConfig, OpenAIConfig
-from .mqtt_client import MQTTClient
-from .openai_client import OpenAIClient
+if TYPE_CHECKING:
+    from .bridge import BridgeStartupError, MQTTLLMBridge
+    from .config import AppConfig, MQTTConfig, OpenAIConfig
+    from .mqtt_client import MQTTClient
+    from .openai_client import OpenAIClient, OpenAIError
+
+# Public names are imported on first access (PEP 562) so that running the
+# CLI does not load paho-mqtt or aiohttp until the bridge actually starts
+_LAZY_IMPORTS = {
+    "MQTTLLMBridge": ".bridge",
+    "BridgeStartupError": ".bridge",
+    "AppConfig": ".config",
+    "MQTTConfig": ".config",
+    "OpenAIConfig": ".config",
+    "MQTTClient": ".mqtt_client",
+    "OpenAIClient": ".openai_client",
+    "OpenAIError": ".openai_client",
+}
 
 __all__ = [
     "MQTTLLMBridge",
+    "BridgeStartupError",
     "AppConfig",
     "MQTTConfig",
     "OpenAIConfig",
     "MQTTClient",
     "OpenAIClient",
+    "OpenAIError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public class lazily on first attribute access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
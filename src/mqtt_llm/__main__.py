@@ -0,0 +1,6 @@
+"""Allow running the bridge with ``python -m mqtt_llm``."""
+
+from .main import main
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,25 @@ import asyncio
 import logging
 import signal
 import sys
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Set
 
 from .config import AppConfig
 from .mqtt_client import MQTTClient
 from .openai_client import OpenAIClient
 
+# Streamed tokens arriving within this window (seconds) are published as one
+# MQTT message, trading a little latency for a much lower message rate
+STREAM_FLUSH_INTERVAL = 0.05
+
+# Messages waiting for a free concurrency slot; further messages are
+# dropped while the queue is full
+MESSAGE_QUEUE_SIZE = 1024
+
+
+class BridgeStartupError(RuntimeError):
+    """Raised when the bridge cannot bring up its API or MQTT connection."""
+
 
 class MQTTLLMBridge:
     """Main bridge application connecting MQTT and OpenAI-compatible APIs."""
@@ -22,23 +35,89 @@ class MQTTLLMBridge:
         self.openai_client: Optional[OpenAIClient] = None
         self.running = False
         self.shutdown_event = asyncio.Event()
+        # Config-derived status fields never change, so build them once
+        self._static_status = {
+            "api_url": config.openai.api_url,
+            "model": config.openai.model,
+            "mqtt_broker": f"{config.mqtt.broker}:{config.mqtt.port}",
+            "subscribe_topic": config.mqtt.subscribe_topic,
+            "publish_topic": config.mqtt.publish_topic,
+        }
+        self._message_queue: asyncio.Queue[str] = asyncio.Queue(
+            maxsize=MESSAGE_QUEUE_SIZE
+        )
+        self._worker_task: Optional[asyncio.Task] = None
+        # Process as many messages at once as the API client can send
+        self._inflight = asyncio.Semaphore(config.openai.max_concurrency)
+        self._inflight_tasks: Set[asyncio.Task] = set()
+        # paho's publish() can block on the socket, so keep it off the loop;
+        # the pool is created on first publish and again after stop(). One
+        # worker keeps each response's chunks together and in order
+        self._publish_executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> "MQTTLLMBridge":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(
+        self, exc_type: type, exc_val: Exception, exc_tb: object
+    ) -> None:
+        """Async context manager exit."""
+        await self.stop()
+
+    async def _get_openai_client(self) -> OpenAIClient:
+        """Return the connected API client, creating it on first use."""
+        if not self.openai_client:
+            self.openai_client = OpenAIClient(self.config.openai)
+            await self.openai_client.connect()
+        return self.openai_client
+
+    def _enqueue_message(self, message: str) -> None:
+        """Queue an incoming MQTT message for processing (runs on the loop)."""
+        try:
+            self._message_queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.logger.warning("Message queue full, dropping message")
+
+    async def _process_messages(self) -> None:
+        """Consume queued messages with bounded concurrency."""
+        while True:
+            message = await self._message_queue.get()
+            # Acquire before creating the task so queued work stays bounded
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._handle_mqtt_message(message))
+            self._inflight_tasks.add(task)
+            task.add_done_callback(self._on_message_done)
+
+    def _on_message_done(self, task: asyncio.Task) -> None:
+        """Release the concurrency slot held by a finished message task."""
+        self._inflight_tasks.discard(task)
+        self._inflight.release()
+        self._message_queue.task_done()
 
     async def _handle_mqtt_message(self, message: str) -> None:
         """Handle incoming MQTT message and generate response."""
         try:
-            self.logger.info(f"Processing message: {message[:100]}...")
+            self.logger.info("Processing message: %.100s...", message)
 
             if not self.openai_client:
                 self.logger.error("OpenAI client not initialized")
                 return
 
+            if self.config.mqtt.stream_response and self.mqtt_client:
+                if await self._stream_response(self.mqtt_client, message):
+                    self.logger.info("Streamed response published")
+                else:
+                    self.logger.warning("Empty response from API")
+                return
+
             # Generate response using OpenAI-compatible API
             response = await self.openai_client.generate_response(message)
 
             if response:
                 # Publish response back to MQTT
                 if self.mqtt_client:
-                    self.mqtt_client.publish_response(response)
+                    await self._publish_response(self.mqtt_client, response)
                     self.logger.info("Response published successfully")
                 else:
                     self.logger.error(
@@ -48,11 +127,60 @@ class MQTTLLMBridge:
                 self.logger.warning("Empty response from API")
 
         except Exception as e:
-            self.logger.error(f"Error processing message: {e}")
+            self.logger.error("Error processing message: %s", e)
             # Optionally publish error response
             if self.mqtt_client:
-                error_response = f"Error processing message: {str(e)}"
-                self.mqtt_client.publish_response(error_response)
+                error_response = f"Error processing message: {e}"
+                await self._publish_response(self.mqtt_client, error_response)
+
+    async def _stream_response(
+        self, mqtt_client: MQTTClient, message: str
+    ) -> bool:
+        """Publish partial responses as the API streams them."""
+        if not self.openai_client:
+            return False
+
+        loop = asyncio.get_running_loop()
+        buffer: list[str] = []
+        published = False
+        last_flush = loop.time()
+
+        async for delta in self.openai_client.generate_response_stream(
+            message
+        ):
+            buffer.append(delta)
+            if loop.time() - last_flush < STREAM_FLUSH_INTERVAL:
+                continue
+            text = "".join(buffer)
+            buffer.clear()
+            last_flush = loop.time()
+            # Whitespace-only fragments still separate the words around them
+            if text:
+                await self._publish(mqtt_client.publish_fragment, text)
+                published = True
+
+        text = "".join(buffer)
+        if text:
+            await self._publish(mqtt_client.publish_fragment, text)
+            published = True
+        return published
+
+    async def _publish_response(
+        self, mqtt_client: MQTTClient, response: str
+    ) -> None:
+        """Publish a response from the publish thread pool."""
+        await self._publish(mqtt_client.publish_response, response)
+
+    async def _publish(
+        self, publish: Callable[[str], None], text: str
+    ) -> None:
+        """Run an MQTT publish call in the publish thread pool."""
+        if self._publish_executor is None:
+            self._publish_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="mqtt-publish"
+            )
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._publish_executor, publish, text)
 
     def _setup_signal_handlers(self) -> None:
         """Set up signal handlers for graceful shutdown."""
@@ -63,8 +191,19 @@ class MQTTLLMBridge:
             self.shutdown_event.set()
 
         # Use asyncio's signal handling which works properly with event loops
-        loop.add_signal_handler(signal.SIGINT, signal_handler)
-        loop.add_signal_handler(signal.SIGTERM, signal_handler)
+        try:
+            loop.add_signal_handler(signal.SIGINT, signal_handler)
+            loop.add_signal_handler(signal.SIGTERM, signal_handler)
+        except NotImplementedError:
+            # Windows event loops do not support add_signal_handler, so
+            # fall back to plain handlers that hop back onto the loop
+            def fallback_handler(signum: int, frame: object) -> None:
+                loop.call_soon_threadsafe(signal_handler)
+
+            signal.signal(signal.SIGINT, fallback_handler)
+            signal.signal(signal.SIGTERM, fallback_handler)
+            if hasattr(signal, "SIGBREAK"):
+                signal.signal(signal.SIGBREAK, fallback_handler)
 
     async def start(self) -> None:
         """Start the bridge components."""
@@ -72,35 +211,32 @@ class MQTTLLMBridge:
             self.logger.info("Starting MQTT-LLM bridge...")
 
             # Initialize OpenAI client
-            self.openai_client = OpenAIClient(self.config.openai)
-            await self.openai_client.connect()
+            openai_client = await self._get_openai_client()
 
-            # Health check for API (if not skipped)
+            # Health check for API (if not skipped); the connection warm-up
+            # can stall on a slow endpoint too, so it is skipped with it
             if not self.config.openai.skip_health_check:
-                if not await self.openai_client.health_check():
-                    raise Exception("API health check failed")
+                await openai_client.warm_up()
+                if not await openai_client.health_check():
+                    raise BridgeStartupError("API health check failed")
             else:
                 self.logger.info("Skipping API health check as requested")
 
+            # Start the message consumer before messages can arrive
+            self._worker_task = asyncio.create_task(self._process_messages())
+
             # Initialize MQTT client
             self.mqtt_client = MQTTClient(self.config.mqtt)
-            self.mqtt_client.set_async_message_handler(
-                self._handle_mqtt_message
-            )
+            self.mqtt_client.set_async_message_handler(self._enqueue_message)
             self.mqtt_client.connect()
 
-            # Wait for MQTT connection
-            retry_count = 0
-            max_retries = 30  # 30 seconds
-            while (
-                not self.mqtt_client.is_connected()
-                and retry_count < max_retries
-            ):
-                await asyncio.sleep(1)
-                retry_count += 1
-
-            if not self.mqtt_client.is_connected():
-                raise Exception(
+            # Wait for the on_connect callback to signal the connection
+            try:
+                await asyncio.wait_for(
+                    self.mqtt_client.wait_until_connected(), timeout=30.0
+                )
+            except asyncio.TimeoutError:
+                raise BridgeStartupError(
                     "Failed to connect to MQTT broker within timeout"
                 )
 
@@ -116,14 +252,33 @@ class MQTTLLMBridge:
         """Stop the bridge components."""
         self.logger.info("Stopping MQTT-LLM bridge...")
         self.running = False
+        self.shutdown_event.set()
+
+        # Stop the message consumer and drain in-flight messages
+        if self._worker_task:
+            self._worker_task.cancel()
+            try:
+                await self._worker_task
+            except asyncio.CancelledError:
+                pass
+            self._worker_task = None
+        if self._inflight_tasks:
+            await asyncio.gather(*self._inflight_tasks, return_exceptions=True)
+
+        # Let queued publishes finish before the MQTT client goes away
+        if self._publish_executor:
+            self._publish_executor.shutdown(wait=True)
+            self._publish_executor = None
 
         # Disconnect MQTT client
         if self.mqtt_client:
             self.mqtt_client.disconnect()
+            self.mqtt_client = None
 
         # Disconnect OpenAI client
         if self.openai_client:
             await self.openai_client.disconnect()
+            self.openai_client = None
 
         self.logger.info("MQTT-LLM bridge stopped")
 
@@ -139,35 +294,34 @@ class MQTTLLMBridge:
             # Run until shutdown signal
             self.logger.info("Bridge is running. Press Ctrl+C to stop.")
 
-            # Use asyncio.wait_for with a timeout to periodically check for shutdown
-            while not self.shutdown_event.is_set():
-                try:
-                    await asyncio.wait_for(
-                        self.shutdown_event.wait(), timeout=1.0
-                    )
-                except asyncio.TimeoutError:
-                    # Check if we should continue running
-                    if not self.running:
-                        break
+            # Block until a signal handler or stop() sets the event
+            await self.shutdown_event.wait()
 
         except KeyboardInterrupt:
             self.logger.info("Received keyboard interrupt")
+        except BridgeStartupError:
+            # start() has already logged the failure and cleaned up
+            sys.exit(1)
         except Exception as e:
             self.logger.error(f"Unexpected error: {e}")
             sys.exit(1)
         finally:
-            await self.stop()
+            # Skip a second teardown when start() already stopped everything
+            if self.running or self.mqtt_client or self.openai_client:
+                await self.stop()
 
     async def run_once(self, message: str) -> str:
-        """Process a single message and return response (for testing)."""
+        """Process a single message and return response (for testing).
+
+        The API client is shared with run() and closed by stop(), so use
+        the bridge as an async context manager when calling this directly.
+        """
         try:
-            # Initialize OpenAI client if needed
-            if not self.openai_client:
-                self.openai_client = OpenAIClient(self.config.openai)
-                await self.openai_client.connect()
+            # Reuse the bridge's pooled client, creating it if needed
+            openai_client = await self._get_openai_client()
 
             # Generate response
-            response = await self.openai_client.generate_response(message)
+            response = await openai_client.generate_response(message)
             return response
 
         except Exception as e:
@@ -185,9 +339,27 @@ class MQTTLLMBridge:
             "mqtt_connected": (
                 self.mqtt_client.is_connected() if self.mqtt_client else False
             ),
-            "api_url": self.config.openai.api_url,
-            "model": self.config.openai.model,
-            "mqtt_broker": f"{self.config.mqtt.broker}:{self.config.mqtt.port}",
-            "subscribe_topic": self.config.mqtt.subscribe_topic,
-            "publish_topic": self.config.mqtt.publish_topic,
+            **self._static_status,
         }
+
+
+def run_bridge(config: AppConfig) -> None:
+    """Run the bridge until shutdown, on uvloop when it is installed."""
+    logger = logging.getLogger(__name__)
+
+    # Prefer uvloop's faster event loop when it is installed
+    loop_factory = None
+    try:
+        import uvloop
+
+        loop_factory = uvloop.new_event_loop
+        logger.debug("Using uvloop event loop")
+    except ImportError:
+        pass
+
+    bridge = MQTTLLMBridge(config)
+    try:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(bridge.run())
+    except KeyboardInterrupt:
+        logger.info("Application interrupted by user")
@@ -0,0 +1,39 @@
+"""In-memory cache of API responses for repeated prompts."""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class ResponseCache:
+    """Least-recently-used cache of responses that expire after a TTL."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Maps prompt -> (expiry time, response), oldest use first
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses, including expired ones."""
+        return len(self._entries)
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the cached response for a prompt, or None."""
+        entry = self._entries.get(prompt)
+        if entry is None:
+            return None
+        expires, response = entry
+        if expires <= time.monotonic():
+            del self._entries[prompt]
+            return None
+        self._entries.move_to_end(prompt)
+        return response
+
+    def put(self, prompt: str, response: str) -> None:
+        """Cache a response, evicting the least recently used if full."""
+        self._entries[prompt] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(prompt)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
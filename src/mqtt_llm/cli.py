@@ -1,13 +1,33 @@
 """Command-line interface for MQTT-LLM bridge."""
 
 import logging
-import os
 from typing import Optional
-from uuid import uuid4
 
 import click
 
-from .config import AppConfig
+# Log level names accepted by --log-level, mapped to logging constants
+_LOG_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+# Display labels for AppConfig.get_summary() keys in --dry-run output
+_SUMMARY_LABELS = {
+    "mqtt_broker": "MQTT Broker",
+    "mqtt_subscribe_topic": "MQTT Subscribe Topic",
+    "mqtt_publish_topic": "MQTT Publish Topic",
+    "mqtt_qos": "MQTT QoS",
+    "mqtt_retain": "MQTT Retain",
+    "mqtt_trigger_pattern": "MQTT Trigger Pattern",
+    "openai_api_url": "OpenAI API URL",
+    "openai_model": "OpenAI Model",
+    "openai_timeout": "OpenAI Timeout",
+    "openai_max_tokens": "OpenAI Max Tokens",
+    "log_level": "Log Level",
+}
 
 
 @click.command()  # type: ignore[misc]
@@ -118,6 +138,12 @@ from .config import AppConfig
     help="Maximum message length in characters. Long responses will be chunked with '1/x:' prefix. Environment: MQTT_MESSAGE_MAX_LENGTH",
     envvar="MQTT_MESSAGE_MAX_LENGTH",
 )
+@click.option(  # type: ignore[misc]
+    "--mqtt-stream-response/--no-mqtt-stream-response",
+    default=False,
+    help="Publish partial responses while the LLM is still generating (default: no-stream). Environment: MQTT_STREAM_RESPONSE",
+    envvar="MQTT_STREAM_RESPONSE",
+)
 @click.option(  # type: ignore[misc]
     "--openai-api-url",
     default="http://localhost:11434",
@@ -160,15 +186,42 @@ from .config import AppConfig
     help="Sampling temperature (0.0-2.0, optional). Environment: OPENAI_TEMPERATURE",
     envvar="OPENAI_TEMPERATURE",
 )
+@click.option(  # type: ignore[misc]
+    "--openai-max-concurrency",
+    type=click.IntRange(min=1),
+    default=10,
+    help="Maximum number of API requests in flight at once (default: 10). Environment: OPENAI_MAX_CONCURRENCY",
+    envvar="OPENAI_MAX_CONCURRENCY",
+)
 @click.option(  # type: ignore[misc]
     "--openai-skip-health-check/--no-openai-skip-health-check",
     default=False,
     help="Skip health check on startup (useful for APIs that don't support /v1/models). Environment: OPENAI_SKIP_HEALTH_CHECK",
     envvar="OPENAI_SKIP_HEALTH_CHECK",
 )
+@click.option(  # type: ignore[misc]
+    "--openai-warm-up-model/--no-openai-warm-up-model",
+    default=False,
+    help="Load the model with a one-token request on startup so the first reply is not delayed (e.g. Ollama). Environment: OPENAI_WARM_UP_MODEL",
+    envvar="OPENAI_WARM_UP_MODEL",
+)
+@click.option(  # type: ignore[misc]
+    "--openai-cache-max-entries",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Number of responses to cache for repeated prompts (default: 0, disabled). Environment: OPENAI_CACHE_MAX_ENTRIES",
+    envvar="OPENAI_CACHE_MAX_ENTRIES",
+)
+@click.option(  # type: ignore[misc]
+    "--openai-cache-ttl",
+    type=float,
+    default=300.0,
+    help="Seconds a cached response is reused (default: 300.0). Environment: OPENAI_CACHE_TTL",
+    envvar="OPENAI_CACHE_TTL",
+)
 @click.option(  # type: ignore[misc]
     "--log-level",
-    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]),
+    type=click.Choice(list(_LOG_LEVELS)),
     default="INFO",
     help="Application logging level (default: INFO). Environment: LOG_LEVEL",
     envvar="LOG_LEVEL",
@@ -198,6 +251,7 @@ def main(
     mqtt_tls_keyfile: Optional[str],
     mqtt_tls_insecure: bool,
     mqtt_message_max_length: Optional[int],
+    mqtt_stream_response: bool,
     openai_api_url: str,
     openai_api_key: Optional[str],
     openai_model: Optional[str],
@@ -205,7 +259,11 @@ def main(
     openai_timeout: float,
     openai_max_tokens: int,
     openai_temperature: Optional[float],
+    openai_max_concurrency: int,
     openai_skip_health_check: bool,
+    openai_warm_up_model: bool,
+    openai_cache_max_entries: int,
+    openai_cache_ttl: float,
     log_level: str,
     dry_run: bool,
 ) -> None:
@@ -238,7 +296,7 @@ def main(
     """
     # Setup logging
     logging.basicConfig(
-        level=getattr(logging, log_level),
+        level=_LOG_LEVELS[log_level],
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
     logger = logging.getLogger(__name__)
@@ -248,118 +306,58 @@ def main(
         logger.info("Loading configuration from environment and CLI arguments")
 
         # Build config from CLI arguments and environment
-        from .config import MQTTConfig, OpenAIConfig
+        from .config import AppConfig, MQTTConfig, OpenAIConfig
+
+        # Only pay for the uuid import when no client ID was configured
+        if not mqtt_client_id:
+            from uuid import uuid4
 
-        # CLI arguments override environment variables
+            mqtt_client_id = str(uuid4())
+
+        # Click already resolves CLI arguments, environment variables and
+        # defaults (in that order), so the parsed values are used directly
         mqtt_config = MQTTConfig(
-            broker=mqtt_broker or os.getenv("MQTT_BROKER", ""),
-            port=(
-                mqtt_port
-                if mqtt_port != 1883
-                else int(os.getenv("MQTT_PORT", "1883"))
-            ),
-            username=mqtt_username or os.getenv("MQTT_USERNAME"),
-            password=mqtt_password or os.getenv("MQTT_PASSWORD"),
-            client_id=mqtt_client_id
-            or os.getenv("MQTT_CLIENT_ID", str(uuid4())),
-            subscribe_topic=mqtt_subscribe_topic
-            or os.getenv("MQTT_SUBSCRIBE_TOPIC", ""),
-            subscribe_path=(
-                mqtt_subscribe_path
-                if mqtt_subscribe_path != "$.text"
-                else os.getenv("MQTT_SUBSCRIBE_PATH", "$.text")
-            ),
-            publish_topic=mqtt_publish_topic
-            or os.getenv("MQTT_PUBLISH_TOPIC", ""),
-            publish_template=(
-                mqtt_publish_template
-                if mqtt_publish_template != "{response}"
-                else os.getenv("MQTT_PUBLISH_TEMPLATE", "{response}")
-            ),
-            qos=mqtt_qos if mqtt_qos != 0 else int(os.getenv("MQTT_QOS", "0")),
-            retain=mqtt_retain
-            if mqtt_retain
-            else os.getenv("MQTT_RETAIN", "false").lower()
-            in ("true", "1", "yes", "on"),
-            sanitize_response=mqtt_sanitize_response
-            if mqtt_sanitize_response
-            else os.getenv("MQTT_SANITIZE_RESPONSE", "false").lower()
-            in ("true", "1", "yes", "on"),
-            trigger_pattern=(
-                mqtt_trigger_pattern
-                if mqtt_trigger_pattern != "@ai"
-                else os.getenv("MQTT_TRIGGER_PATTERN", "@ai")
-            ),
-            use_tls=mqtt_use_tls
-            if mqtt_use_tls
-            else os.getenv("MQTT_USE_TLS", "false").lower()
-            in ("true", "1", "yes", "on"),
-            tls_ca_certs=mqtt_tls_ca_certs or os.getenv("MQTT_TLS_CA_CERTS"),
-            tls_certfile=mqtt_tls_certfile or os.getenv("MQTT_TLS_CERTFILE"),
-            tls_keyfile=mqtt_tls_keyfile or os.getenv("MQTT_TLS_KEYFILE"),
-            tls_insecure=mqtt_tls_insecure
-            if mqtt_tls_insecure
-            else os.getenv("MQTT_TLS_INSECURE", "false").lower()
-            in ("true", "1", "yes", "on"),
-            message_max_length=(
-                mqtt_message_max_length
-                if mqtt_message_max_length is not None
-                else (
-                    int(length_str)
-                    if (length_str := os.getenv("MQTT_MESSAGE_MAX_LENGTH"))
-                    else None
-                )
-            ),
+            broker=mqtt_broker or "",
+            port=mqtt_port,
+            username=mqtt_username,
+            password=mqtt_password,
+            client_id=mqtt_client_id,
+            subscribe_topic=mqtt_subscribe_topic or "",
+            subscribe_path=mqtt_subscribe_path,
+            publish_topic=mqtt_publish_topic or "",
+            publish_template=mqtt_publish_template,
+            qos=mqtt_qos,
+            retain=mqtt_retain,
+            sanitize_response=mqtt_sanitize_response,
+            trigger_pattern=mqtt_trigger_pattern,
+            use_tls=mqtt_use_tls,
+            tls_ca_certs=mqtt_tls_ca_certs,
+            tls_certfile=mqtt_tls_certfile,
+            tls_keyfile=mqtt_tls_keyfile,
+            tls_insecure=mqtt_tls_insecure,
+            message_max_length=mqtt_message_max_length,
+            stream_response=mqtt_stream_response,
         )
 
         openai_config = OpenAIConfig(
-            api_url=(
-                openai_api_url
-                if openai_api_url != "http://localhost:11434"
-                else os.getenv("OPENAI_API_URL", "http://localhost:11434")
-            ),
-            api_key=openai_api_key or os.getenv("OPENAI_API_KEY"),
-            model=openai_model or os.getenv("OPENAI_MODEL", ""),
-            system_prompt=(
-                openai_system_prompt
-                if openai_system_prompt != "You are a helpful assistant."
-                else os.getenv(
-                    "OPENAI_SYSTEM_PROMPT", "You are a helpful assistant."
-                )
-            ),
-            timeout=(
-                openai_timeout
-                if openai_timeout != 30.0
-                else float(os.getenv("OPENAI_TIMEOUT", "30.0"))
-            ),
-            max_tokens=(
-                openai_max_tokens
-                if openai_max_tokens != 1000
-                else int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
-            ),
-            temperature=(
-                openai_temperature
-                if openai_temperature is not None
-                else (
-                    float(temp_str)
-                    if (temp_str := os.getenv("OPENAI_TEMPERATURE"))
-                    else None
-                )
-            ),
-            skip_health_check=openai_skip_health_check
-            if openai_skip_health_check
-            else os.getenv("OPENAI_SKIP_HEALTH_CHECK", "false").lower()
-            in ("true", "1", "yes", "on"),
+            api_url=openai_api_url,
+            api_key=openai_api_key,
+            model=openai_model or "",
+            system_prompt=openai_system_prompt,
+            timeout=openai_timeout,
+            max_tokens=openai_max_tokens,
+            temperature=openai_temperature,
+            max_concurrency=openai_max_concurrency,
+            skip_health_check=openai_skip_health_check,
+            warm_up_model=openai_warm_up_model,
+            cache_max_entries=openai_cache_max_entries,
+            cache_ttl=openai_cache_ttl,
         )
 
         app_config = AppConfig(
             mqtt=mqtt_config,
             openai=openai_config,
-            log_level=(
-                log_level
-                if log_level != "INFO"
-                else os.getenv("LOG_LEVEL", "INFO")
-            ),
+            log_level=log_level,
         )
 
         # Validate the complete configuration
@@ -367,24 +365,16 @@ def main(
 
         if dry_run:
             click.echo("Configuration validation successful!")
-            summary = app_config.get_summary()
-            for key, value in summary.items():
-                click.echo(f"{key.replace('_', ' ').title()}: {value}")
+            for key, value in app_config.get_summary().items():
+                click.echo(f"{_SUMMARY_LABELS.get(key, key)}: {value}")
             return
 
         logger.info("Starting MQTT-LLM bridge...")
 
         # Import and run the application
-        import asyncio
-
-        from .bridge import MQTTLLMBridge
+        from .bridge import run_bridge
 
-        bridge = MQTTLLMBridge(app_config)
-        try:
-            asyncio.run(bridge.run())
-        except KeyboardInterrupt:
-            logger.info("Application interrupted by user")
-            pass  # Exit gracefully
+        run_bridge(app_config)
 
     except Exception as e:
         logger.error(f"Error: {e}")
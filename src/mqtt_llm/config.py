@@ -1,21 +1,122 @@
 """Configuration management for MQTT-LLM bridge."""
 
 import os
-from typing import Optional, Union
-from uuid import uuid4
-
-from pydantic import BaseModel, Field, field_validator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# JSONPath expressions that select a single top-level key, e.g. "$.text"
+_SIMPLE_JSONPATH = re.compile(r"\$\.([A-Za-z_][A-Za-z0-9_]*)")
+
+
+# Values accepted as true for boolean environment variables; matches the
+# strings click accepts for the equivalent CLI flags
+_TRUTHY = frozenset(("true", "1", "yes", "on", "t", "y"))
+
+
+# Logging level names accepted for log_level, in display order
+_LOG_LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_VALID_LOG_LEVELS = frozenset(_LOG_LEVEL_NAMES)
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Parse a boolean environment variable."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    # Canonical spellings match directly without allocating a new string
+    if value in _TRUTHY:
+        return True
+    return value.strip().lower() in _TRUTHY
+
+
+def _env_number(
+    name: str,
+    default: Optional[str],
+    convert: Callable[[str], Any],
+    kind: str,
+) -> Any:
+    """Parse a numeric environment variable, or None if optional and unset."""
+    value = os.environ.get(name, default)
+    if value is None or (default is None and not value):
+        return None
+    try:
+        return convert(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} value: {value}. Must be {kind}.")
+
+
+# Environment variables parsed by AppConfig.from_env(), keyed by field:
+# boolean flags as (field, variable) and numbers as
+# (field, variable, default, converter, description of expected value)
+_MQTT_ENV_FLAGS = (
+    ("retain", "MQTT_RETAIN"),
+    ("sanitize_response", "MQTT_SANITIZE_RESPONSE"),
+    ("use_tls", "MQTT_USE_TLS"),
+    ("tls_insecure", "MQTT_TLS_INSECURE"),
+    ("stream_response", "MQTT_STREAM_RESPONSE"),
+)
+_MQTT_ENV_NUMBERS = (
+    ("port", "MQTT_PORT", "1883", int, "an integer"),
+    ("qos", "MQTT_QOS", "0", int, "an integer"),
+)
+_OPENAI_ENV_NUMBERS = (
+    ("timeout", "OPENAI_TIMEOUT", "30.0", float, "a number"),
+    ("max_tokens", "OPENAI_MAX_TOKENS", "1000", int, "an integer"),
+    ("temperature", "OPENAI_TEMPERATURE", None, float, "a number"),
+    ("cache_max_entries", "OPENAI_CACHE_MAX_ENTRIES", "0", int, "an integer"),
+    ("cache_ttl", "OPENAI_CACHE_TTL", "300.0", float, "a number"),
+    ("max_concurrency", "OPENAI_MAX_CONCURRENCY", "10", int, "an integer"),
+)
+
+
+@lru_cache(maxsize=32)
+def _compile_trigger(pattern: str) -> Optional[re.Pattern[str]]:
+    """Compile a trigger pattern, or return None if it is invalid."""
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _parse_jsonpath(path: str) -> Any:
+    """Parse a JSONPath expression once per distinct path."""
+    from jsonpath_ng import parse
+
+    return parse(path)
+
+
+@lru_cache(maxsize=32)
+def _simple_jsonpath_key(path: str) -> Optional[str]:
+    """Return the key when a path selects one top-level key, else None."""
+    match = _SIMPLE_JSONPATH.fullmatch(path)
+    return match.group(1) if match else None
+
+
+def _default_client_id() -> str:
+    """Generate a random MQTT client ID."""
+    # uuid is only needed when no client ID is configured
+    from uuid import uuid4
+
+    return str(uuid4())
 
 
 class MQTTConfig(BaseModel):
     """MQTT configuration settings."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     broker: str = Field(..., description="MQTT broker address")
-    port: int = Field(default=1883, description="MQTT broker port")
+    port: int = Field(
+        default=1883, ge=1, le=65535, description="MQTT broker port"
+    )
     username: Optional[str] = Field(default=None, description="MQTT username")
     password: Optional[str] = Field(default=None, description="MQTT password")
     client_id: str = Field(
-        default_factory=lambda: str(uuid4()), description="MQTT client ID"
+        default_factory=_default_client_id, description="MQTT client ID"
     )
     subscribe_topic: str = Field(..., description="Topic to subscribe to")
     subscribe_path: str = Field(
@@ -59,19 +160,34 @@ class MQTTConfig(BaseModel):
         gt=0,
         description="Maximum message length in characters. If set, long responses will be chunked into multiple messages with '1/x:' prefix",
     )
+    stream_response: bool = Field(
+        default=False,
+        description="Publish partial responses as they are generated",
+    )
 
-    @field_validator("port")  # type: ignore[misc]
-    @classmethod
-    def validate_port(cls, v: int) -> int:
-        """Validate MQTT port range."""
-        if not 1 <= v <= 65535:
-            raise ValueError("Port must be between 1 and 65535")
-        return v
+    # Derived values are looked up from the field each time rather than
+    # cached on the instance, so model_copy(update=...) never sees stale ones
+    @property
+    def trigger_regex(self) -> Optional[re.Pattern[str]]:
+        """Return the compiled trigger pattern, or None if it is invalid."""
+        return _compile_trigger(self.trigger_pattern)
+
+    @property
+    def subscribe_path_expr(self) -> Any:
+        """Return the parsed JSONPath expression for subscribe_path."""
+        return _parse_jsonpath(self.subscribe_path)
+
+    @property
+    def subscribe_path_key(self) -> Optional[str]:
+        """Return the key when subscribe_path selects one top-level key."""
+        return _simple_jsonpath_key(self.subscribe_path)
 
 
 class OpenAIConfig(BaseModel):
     """OpenAI-compatible API configuration settings."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     api_url: str = Field(
         default="http://localhost:11434",
         description="OpenAI-compatible API URL (e.g., Ollama, OpenRouter)",
@@ -98,15 +214,34 @@ class OpenAIConfig(BaseModel):
         le=2.0,
         description="Sampling temperature (0.0-2.0)",
     )
+    max_concurrency: int = Field(
+        default=10,
+        ge=1,
+        description="Maximum number of API requests in flight at once",
+    )
     skip_health_check: bool = Field(
         default=False,
         description="Skip health check on startup (useful for APIs that don't support /v1/models)",
     )
+    warm_up_model: bool = Field(
+        default=False,
+        description="Send a one-token request on connect so local backends load the model",
+    )
+    cache_max_entries: int = Field(
+        default=0,
+        ge=0,
+        description="Number of responses to cache for repeated prompts (0 disables)",
+    )
+    cache_ttl: float = Field(
+        default=300.0, gt=0, description="Seconds a cached response is reused"
+    )
 
 
 class AppConfig(BaseModel):
     """Main application configuration."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     mqtt: MQTTConfig
     openai: OpenAIConfig
     log_level: str = Field(default="INFO", description="Logging level")
@@ -115,60 +250,30 @@ class AppConfig(BaseModel):
     @classmethod
     def validate_log_level(cls, v: str) -> str:
         """Validate logging level."""
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if v.upper() not in valid_levels:
-            raise ValueError(f"Log level must be one of: {valid_levels}")
-        return v.upper()
+        if v in _VALID_LOG_LEVELS:
+            return v
+        level = v.upper()
+        if level not in _VALID_LOG_LEVELS:
+            raise ValueError(
+                f"Log level must be one of: {list(_LOG_LEVEL_NAMES)}"
+            )
+        return level
 
     @classmethod
     def from_env(cls) -> "AppConfig":
         """Load configuration from environment variables with validation."""
+        env = os.environ
         try:
-            # Parse MQTT port with validation
-            mqtt_port_str = os.getenv("MQTT_PORT", "1883")
-            try:
-                mqtt_port = int(mqtt_port_str)
-            except ValueError:
-                raise ValueError(
-                    f"Invalid MQTT_PORT value: {mqtt_port_str}. Must be an integer."
-                )
-
-            # Parse MQTT QoS with validation
-            mqtt_qos_str = os.getenv("MQTT_QOS", "0")
-            try:
-                mqtt_qos = int(mqtt_qos_str)
-            except ValueError:
-                raise ValueError(
-                    f"Invalid MQTT_QOS value: {mqtt_qos_str}. Must be an integer."
-                )
-
-            # Parse MQTT retain boolean
-            mqtt_retain_str = os.getenv("MQTT_RETAIN", "false").lower()
-            mqtt_retain = mqtt_retain_str in ("true", "1", "yes", "on")
-
-            # Parse MQTT sanitize response boolean
-            mqtt_sanitize_str = os.getenv(
-                "MQTT_SANITIZE_RESPONSE", "false"
-            ).lower()
-            mqtt_sanitize = mqtt_sanitize_str in ("true", "1", "yes", "on")
-
-            # Parse MQTT TLS boolean
-            mqtt_use_tls_str = os.getenv("MQTT_USE_TLS", "false").lower()
-            mqtt_use_tls = mqtt_use_tls_str in ("true", "1", "yes", "on")
-
-            # Parse MQTT TLS insecure boolean
-            mqtt_tls_insecure_str = os.getenv(
-                "MQTT_TLS_INSECURE", "false"
-            ).lower()
-            mqtt_tls_insecure = mqtt_tls_insecure_str in (
-                "true",
-                "1",
-                "yes",
-                "on",
+            mqtt_config: dict[str, Any] = {
+                field: _env_bool(name) for field, name in _MQTT_ENV_FLAGS
+            }
+            mqtt_config.update(
+                (field, _env_number(name, default, convert, kind))
+                for field, name, default, convert, kind in _MQTT_ENV_NUMBERS
             )
 
             # Parse MQTT message max length with validation
-            mqtt_max_length_str = os.getenv("MQTT_MESSAGE_MAX_LENGTH")
+            mqtt_max_length_str = env.get("MQTT_MESSAGE_MAX_LENGTH")
             mqtt_max_length = None
             if mqtt_max_length_str:
                 try:
@@ -180,87 +285,49 @@ class AppConfig(BaseModel):
                         f"Invalid MQTT_MESSAGE_MAX_LENGTH value: {mqtt_max_length_str}. Must be a positive integer."
                     )
 
-            mqtt_config = MQTTConfig(
-                broker=os.getenv("MQTT_BROKER", ""),
-                port=mqtt_port,
-                username=os.getenv("MQTT_USERNAME"),
-                password=os.getenv("MQTT_PASSWORD"),
-                client_id=os.getenv("MQTT_CLIENT_ID", str(uuid4())),
-                subscribe_topic=os.getenv("MQTT_SUBSCRIBE_TOPIC", ""),
-                subscribe_path=os.getenv("MQTT_SUBSCRIBE_PATH", "$.text"),
-                publish_topic=os.getenv("MQTT_PUBLISH_TOPIC", ""),
-                publish_template=os.getenv(
+            mqtt_config.update(
+                broker=env.get("MQTT_BROKER", ""),
+                username=env.get("MQTT_USERNAME"),
+                password=env.get("MQTT_PASSWORD"),
+                subscribe_topic=env.get("MQTT_SUBSCRIBE_TOPIC", ""),
+                subscribe_path=env.get("MQTT_SUBSCRIBE_PATH", "$.text"),
+                publish_topic=env.get("MQTT_PUBLISH_TOPIC", ""),
+                publish_template=env.get(
                     "MQTT_PUBLISH_TEMPLATE", "{response}"
                 ),
-                qos=mqtt_qos,
-                retain=mqtt_retain,
-                sanitize_response=mqtt_sanitize,
-                trigger_pattern=os.getenv("MQTT_TRIGGER_PATTERN", "@ai"),
-                use_tls=mqtt_use_tls,
-                tls_ca_certs=os.getenv("MQTT_TLS_CA_CERTS"),
-                tls_certfile=os.getenv("MQTT_TLS_CERTFILE"),
-                tls_keyfile=os.getenv("MQTT_TLS_KEYFILE"),
-                tls_insecure=mqtt_tls_insecure,
+                trigger_pattern=env.get("MQTT_TRIGGER_PATTERN", "@ai"),
+                tls_ca_certs=env.get("MQTT_TLS_CA_CERTS"),
+                tls_certfile=env.get("MQTT_TLS_CERTFILE"),
+                tls_keyfile=env.get("MQTT_TLS_KEYFILE"),
                 message_max_length=mqtt_max_length,
             )
-
-            # Parse OpenAI timeout with validation
-            openai_timeout_str = os.getenv("OPENAI_TIMEOUT", "30.0")
-            try:
-                openai_timeout = float(openai_timeout_str)
-            except ValueError:
-                raise ValueError(
-                    f"Invalid OPENAI_TIMEOUT value: {openai_timeout_str}. Must be a number."
-                )
-
-            # Parse OpenAI max tokens with validation
-            openai_max_tokens_str = os.getenv("OPENAI_MAX_TOKENS", "1000")
-            try:
-                openai_max_tokens = int(openai_max_tokens_str)
-            except ValueError:
-                raise ValueError(
-                    f"Invalid OPENAI_MAX_TOKENS value: {openai_max_tokens_str}. Must be an integer."
-                )
-
-            # Parse OpenAI temperature with validation
-            openai_temperature_str = os.getenv("OPENAI_TEMPERATURE")
-            openai_temperature = None
-            if openai_temperature_str:
-                try:
-                    openai_temperature = float(openai_temperature_str)
-                except ValueError:
-                    raise ValueError(
-                        f"Invalid OPENAI_TEMPERATURE value: {openai_temperature_str}. Must be a number."
-                    )
-
-            # Parse skip health check boolean
-            skip_health_check_str = os.getenv(
-                "OPENAI_SKIP_HEALTH_CHECK", "false"
-            ).lower()
-            skip_health_check = skip_health_check_str in (
-                "true",
-                "1",
-                "yes",
-                "on",
-            )
-
-            openai_config = OpenAIConfig(
-                api_url=os.getenv("OPENAI_API_URL", "http://localhost:11434"),
-                api_key=os.getenv("OPENAI_API_KEY"),
-                model=os.getenv("OPENAI_MODEL", ""),
-                system_prompt=os.getenv(
+            # Leave client_id unset so the default factory only runs when
+            # no ID is configured
+            if env.get("MQTT_CLIENT_ID"):
+                mqtt_config["client_id"] = env["MQTT_CLIENT_ID"]
+
+            openai_config: dict[str, Any] = {
+                field: _env_number(name, default, convert, kind)
+                for field, name, default, convert, kind in _OPENAI_ENV_NUMBERS
+            }
+            openai_config.update(
+                api_url=env.get("OPENAI_API_URL", "http://localhost:11434"),
+                api_key=env.get("OPENAI_API_KEY"),
+                model=env.get("OPENAI_MODEL", ""),
+                system_prompt=env.get(
                     "OPENAI_SYSTEM_PROMPT", "You are a helpful assistant."
                 ),
-                timeout=openai_timeout,
-                max_tokens=openai_max_tokens,
-                temperature=openai_temperature,
-                skip_health_check=skip_health_check,
+                skip_health_check=_env_bool("OPENAI_SKIP_HEALTH_CHECK"),
+                warm_up_model=_env_bool("OPENAI_WARM_UP_MODEL"),
             )
 
-            return cls(
-                mqtt=mqtt_config,
-                openai=openai_config,
-                log_level=os.getenv("LOG_LEVEL", "INFO"),
+            # Validate the whole tree in one pass of the model's validator
+            return cls.model_validate(
+                {
+                    "mqtt": mqtt_config,
+                    "openai": openai_config,
+                    "log_level": env.get("LOG_LEVEL", "INFO"),
+                }
             )
 
         except ValueError as e:
@@ -269,7 +336,11 @@ class AppConfig(BaseModel):
             )
 
     def validate_config(self) -> None:
-        """Validate the complete configuration and check for issues."""
+        """Check that the required settings have been provided.
+
+        Ranges and formats are enforced by the field constraints when the
+        models are built, so only presence checks happen here.
+        """
         errors = []
 
         # Validate required MQTT fields
@@ -280,48 +351,10 @@ class AppConfig(BaseModel):
         if not self.mqtt.publish_topic:
             errors.append("MQTT publish topic is required")
 
-        # Validate MQTT QoS range
-        if not 0 <= self.mqtt.qos <= 2:
-            errors.append(f"MQTT QoS must be 0, 1, or 2, got: {self.mqtt.qos}")
-
-        # Validate MQTT port range
-        if not 1 <= self.mqtt.port <= 65535:
-            errors.append(
-                f"MQTT port must be between 1-65535, got: {self.mqtt.port}"
-            )
-
         # Validate required OpenAI fields
         if not self.openai.model:
             errors.append("Model name is required")
 
-        # Validate OpenAI timeout
-        if self.openai.timeout <= 0:
-            errors.append(
-                f"API timeout must be positive, got: {self.openai.timeout}"
-            )
-
-        # Validate OpenAI max_tokens
-        if self.openai.max_tokens <= 0:
-            errors.append(
-                f"Max tokens must be positive, got: {self.openai.max_tokens}"
-            )
-
-        # Validate temperature if set
-        if (
-            self.openai.temperature is not None
-            and not 0.0 <= self.openai.temperature <= 2.0
-        ):
-            errors.append(
-                f"Temperature must be between 0.0 and 2.0, got: {self.openai.temperature}"
-            )
-
-        # Validate log level
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.log_level.upper() not in valid_levels:
-            errors.append(
-                f"Log level must be one of {valid_levels}, got: {self.log_level}"
-            )
-
         if errors:
             raise ValueError(
                 "Configuration validation failed:\n"
@@ -330,6 +363,8 @@ class AppConfig(BaseModel):
 
     def get_summary(self) -> dict:
         """Get a summary of the configuration for logging/display."""
+        # Built on each call: it is cheap, and a cached dict would be shared
+        # with callers and carried over by model_copy() and pickling
         return {
             "mqtt_broker": f"{self.mqtt.broker}:{self.mqtt.port}",
             "mqtt_subscribe_topic": self.mqtt.subscribe_topic,
@@ -0,0 +1,32 @@
+"""JSON helpers that use orjson when it is installed."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # orjson is an optional speed-up (the "fast" extra)
+    HAS_ORJSON = False
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when available, else the stdlib parser."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize JSON straight to UTF-8 bytes for a request body."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize JSON with two-space indentation for log output."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
@@ -1,11 +1,43 @@
 """Main entry point for MQTT-LLM bridge application."""
 
+import os
+import sys
+
+
+def _run_service() -> None:
+    """Run the bridge from environment variables, bypassing the CLI."""
+    import logging
+
+    from .bridge import run_bridge
+    from .config import AppConfig
+
+    try:
+        config = AppConfig.from_env()
+        config.validate_config()
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    logging.basicConfig(
+        level=config.log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    logger = logging.getLogger(__name__)
+    logger.info("Starting MQTT-LLM bridge...")
+    run_bridge(config)
+
 
 def main() -> None:
     """Run the main entry point."""
+    # Supervised deployments configured purely through the environment can
+    # skip building the click command entirely
+    if os.environ.get("MQTT_LLM_SERVICE") == "1" and len(sys.argv) == 1:
+        _run_service()
+        return
+
     from .cli import main as cli_main
 
-    cli_main()
+    # Keep the usage line as "mqtt-llm" under "python -m mqtt_llm" too
+    cli_main(prog_name="mqtt-llm")
 
 
 if __name__ == "__main__":
@@ -4,14 +4,125 @@ import asyncio
 import json
 import logging
 import re
+import string
 import unicodedata
-from typing import Any, Callable, Dict, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Optional,
+    Set,
+    Union,
+)
 
 import paho.mqtt.client as mqtt
-from jsonpath_ng import parse
 
+from . import jsonutil
 from .config import MQTTConfig
 
+# paho's publish() return code for a queued message
+_MQTT_OK = mqtt.MQTT_ERR_SUCCESS
+
+# Sanitization patterns, applied in order by MQTTClient._sanitize_response
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TAG_PATTERN = re.compile(r"<[^>]*>")
+_MARKDOWN_PATTERNS = (
+    (re.compile(r"\*\*(.*?)\*\*"), r"\1"),  # **bold**
+    (re.compile(r"\*(.*?)\*"), r"\1"),  # *italic*
+    (re.compile(r"_(.*?)_"), r"\1"),  # _italic_
+    (re.compile(r"`(.*?)`"), r"\1"),  # `code`
+    (re.compile(r"#{1,6}\s*"), ""),  # # headers
+    (re.compile(r"\[(.*?)\]\(.*?\)"), r"\1"),  # [text](link)
+)
+
+# Reasons for a refused connection, keyed by CONNACK return code
+_MQTT_CONNECT_ERRORS = {
+    1: "Connection refused - incorrect protocol version",
+    2: "Connection refused - invalid client identifier",
+    3: "Connection refused - server unavailable",
+    4: "Connection refused - bad username or password",
+    5: "Connection refused - not authorised",
+}
+
+# Room reserved in each chunk for its "X/Y: " prefix; enough for "999/999: "
+_CHUNK_PREFIX_SPACE = 10
+
+# Characters _chunk_text prefers to split after
+_BREAK_CHARS = " \n\t.!?;,"
+
+# First bytes a JSON value can start with
+_JSON_START_BYTES = frozenset(bytes([c]) for c in b'{["-0123456789tfn')
+
+# Text is ASCII by the time control characters are stripped, so the C0
+# range and DEL cover every remaining "Cc" code point
+_CONTROL_CHARS = dict.fromkeys([*range(0x20), 0x7F])
+
+
+# Stands in for "{response}" while a JSON template is parsed
+_RESPONSE_PLACEHOLDER = "__RESPONSE_PLACEHOLDER__"
+
+
+def _compile_template(template: Union[str, dict]) -> Callable[[str], str]:
+    """Pre-parse a publish template into a function that renders it."""
+    if isinstance(template, str) and not (
+        template.strip().startswith("{") and template.strip().endswith("}")
+    ):
+        return _compile_string_template(template)
+
+    if isinstance(template, str):
+        try:
+            parsed = json.loads(
+                template.replace("{response}", _RESPONSE_PLACEHOLDER)
+            )
+        except json.JSONDecodeError:
+            return _compile_string_template(template)
+    else:
+        parsed = json.loads(
+            json.dumps(template).replace("{response}", _RESPONSE_PLACEHOLDER)
+        )
+
+    # JSON escaping is per character, so splicing the escaped response
+    # into the serialized template matches serializing the filled template.
+    # The stdlib encoder is used even when orjson is installed so published
+    # bytes (spacing, ASCII escapes) do not depend on optional extras
+    splice = _splice(json.dumps(parsed).split(_RESPONSE_PLACEHOLDER))
+    return lambda response: splice(json.dumps(response)[1:-1])
+
+
+def _compile_string_template(template: str) -> Callable[[str], str]:
+    """Pre-parse a str.format template that only uses {response}."""
+    segments = [""]
+    try:
+        for literal, field, spec, conversion in string.Formatter().parse(
+            template
+        ):
+            segments[-1] += literal
+            if field is None:
+                continue
+            if field != "response" or spec or conversion:
+                # Anything fancier is left to str.format
+                return lambda response: template.format(response=response)
+            segments.append("")
+    except ValueError:
+        # Malformed templates raise from str.format at publish time
+        return lambda response: template.format(response=response)
+    return _splice(segments)
+
+
+def _splice(parts: list) -> Callable[[str], str]:
+    """Return a function that joins the parts around its argument."""
+    if len(parts) == 1:
+        constant = parts[0]
+        return lambda text: constant
+    if len(parts) == 2:
+        # A single placeholder, the usual case, is plain concatenation
+        before, after = parts
+        if not before and not after:
+            return lambda text: text
+        return lambda text: before + text + after
+    return lambda text: text.join(parts)
+
 
 class MQTTClient:
     """MQTT client for handling connections, subscriptions, and publishing."""
@@ -26,7 +137,22 @@ class MQTTClient:
         self.async_message_handler: Optional[
             Union[Callable[[str], None], Callable]
         ] = None
+        self._coroutine_handler: Optional[
+            Callable[[str], Coroutine[Any, Any, None]]
+        ] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connected_event = asyncio.Event()
+        # Running coroutine handler calls, referenced until they finish
+        self._handler_tasks: Set[asyncio.Task] = set()
+        self._render_template = _compile_template(config.publish_template)
+        # Config is frozen, so the chunk size can be worked out once
+        self._chunk_size = (
+            config.message_max_length - _CHUNK_PREFIX_SPACE
+            if config.message_max_length
+            else 0
+        )
+        # "$" selects the whole payload, so it is passed through unparsed
+        self._is_raw_passthrough = config.subscribe_path == "$"
 
     def set_message_handler(self, handler: Callable[[str], None]) -> None:
         """Set the message handler callback."""
@@ -37,6 +163,10 @@ class MQTTClient:
     ) -> None:
         """Set the async message handler callback."""
         self.async_message_handler = handler
+        # Resolved once here rather than for every incoming message
+        self._coroutine_handler = (
+            handler if asyncio.iscoroutinefunction(handler) else None
+        )
 
     def _on_connect(
         self, client: mqtt.Client, userdata: Any, flags: Dict, rc: int
@@ -44,6 +174,7 @@ class MQTTClient:
         """Handle MQTT connection event."""
         if rc == 0:
             self.connected = True
+            self._set_connected_event(True)
             self.logger.info(f"Connected to MQTT broker {self.config.broker}")
             # Subscribe to the configured topic
             client.subscribe(self.config.subscribe_topic, qos=self.config.qos)
@@ -52,14 +183,7 @@ class MQTTClient:
             )
         else:
             self.connected = False
-            error_messages = {
-                1: "Connection refused - incorrect protocol version",
-                2: "Connection refused - invalid client identifier",
-                3: "Connection refused - server unavailable",
-                4: "Connection refused - bad username or password",
-                5: "Connection refused - not authorised",
-            }
-            error_msg = error_messages.get(
+            error_msg = _MQTT_CONNECT_ERRORS.get(
                 rc, f"Connection failed with code {rc}"
             )
             self.logger.error(f"MQTT connection failed: {error_msg}")
@@ -69,6 +193,7 @@ class MQTTClient:
     ) -> None:
         """Handle MQTT disconnection event."""
         self.connected = False
+        self._set_connected_event(False)
         if rc == 0:
             self.logger.info("Disconnected from MQTT broker")
         else:
@@ -76,77 +201,125 @@ class MQTTClient:
                 f"Unexpected disconnection from MQTT broker: {rc}"
             )
 
+    def _set_connected_event(self, connected: bool) -> None:
+        """Update the connection event from the paho network thread."""
+        if not self._loop or self._loop.is_closed():
+            return
+        if connected:
+            self._loop.call_soon_threadsafe(self._connected_event.set)
+        else:
+            self._loop.call_soon_threadsafe(self._connected_event.clear)
+
+    async def wait_until_connected(self) -> None:
+        """Wait until the broker has accepted the connection."""
+        await self._connected_event.wait()
+
     def _on_message(
         self, client: mqtt.Client, userdata: Any, message: mqtt.MQTTMessage
     ) -> None:
         """Handle incoming MQTT messages."""
-        try:
-            payload = message.payload.decode("utf-8")
-            self.logger.debug(
-                f"Received message on topic {message.topic}: {payload}"
-            )
+        # The JSON parser reads bytes directly; text is only decoded
+        # for payloads that turn out not to be JSON
+        payload = message.payload
+        self.logger.debug(
+            "Received message on topic %s: %r", message.topic, payload
+        )
 
-            # Extract text content based on configuration
-            extracted_text = self._extract_text_content(payload)
+        if self._loop and not self._loop.is_closed():
+            # Parse on the event loop so paho's network thread only reads
+            self._loop.call_soon_threadsafe(self._dispatch_payload, payload)
+            return
 
-            if extracted_text:
-                # Check if message contains trigger pattern
-                if not self._should_trigger_ai(extracted_text):
-                    self.logger.debug(
-                        f"Message does not contain trigger pattern '{self.config.trigger_pattern}', ignoring"
-                    )
-                    return
-                if self.async_message_handler:
-                    try:
-                        # Use thread-safe scheduling to run async handler in main event loop
-                        if asyncio.iscoroutinefunction(
-                            self.async_message_handler
-                        ):
-                            if self._loop and not self._loop.is_closed():
-                                # Schedule the coroutine to run in the main event loop
-                                asyncio.run_coroutine_threadsafe(
-                                    self.async_message_handler(extracted_text),
-                                    self._loop,
-                                )
-                            else:
-                                self.logger.error(
-                                    "No event loop available for async handler"
-                                )
-                        else:
-                            self.async_message_handler(extracted_text)
-                    except Exception as e:
-                        self.logger.error(
-                            f"Error scheduling async handler: {e}"
-                        )
-                elif self.message_handler:
-                    self.message_handler(extracted_text)
-                else:
-                    self.logger.warning("No message handler set")
+        try:
+            text = self._message_text(payload)
+            if text is None:
+                return
+            if self._coroutine_handler:
+                self.logger.error("No event loop available for async handler")
             else:
-                self.logger.warning("No text extracted from message")
+                self._call_sync_handler(text)
+        except Exception as e:
+            self.logger.error(f"Error processing message: {e}")
 
+    def _dispatch_payload(self, payload: bytes) -> None:
+        """Extract, trigger-check and dispatch a payload (runs on the loop)."""
+        try:
+            text = self._message_text(payload)
+            if text is None:
+                return
+            if self._coroutine_handler and self._loop:
+                # Each message gets its own task, so a slow handler does
+                # not hold up the messages behind it
+                task = self._loop.create_task(self._coroutine_handler(text))
+                self._handler_tasks.add(task)
+                task.add_done_callback(self._handler_tasks.discard)
+            else:
+                self._call_sync_handler(text)
         except Exception as e:
             self.logger.error(f"Error processing message: {e}")
 
-    def _extract_text_content(self, payload: str) -> Optional[str]:
+    def _message_text(self, payload: bytes) -> Optional[str]:
+        """Return the payload's text if it should be passed to a handler."""
+        extracted_text = self._extract_text_content(payload)
+        if not extracted_text:
+            self.logger.warning("No text extracted from message")
+            return None
+
+        # Check if message contains trigger pattern
+        if not self._should_trigger_ai(extracted_text):
+            self.logger.debug(
+                "Message does not contain trigger pattern '%s', ignoring",
+                self.config.trigger_pattern,
+            )
+            return None
+        return extracted_text
+
+    def _call_sync_handler(self, text: str) -> None:
+        """Pass text to whichever non-coroutine handler is set."""
+        if self.async_message_handler:
+            self.async_message_handler(text)
+        elif self.message_handler:
+            self.message_handler(text)
+        else:
+            self.logger.warning("No message handler set")
+
+    def _extract_text_content(self, payload: bytes) -> Optional[str]:
         """Extract text content from message payload using JSON path."""
+        if self._is_raw_passthrough:
+            return payload.decode("utf-8", "replace")
+
+        # Payloads that cannot start a JSON value skip straight to the
+        # plain-text handling; JSON scalars are still parsed so a key path
+        # finds nothing in them and drops the message
+        if payload.lstrip()[:1] not in _JSON_START_BYTES:
+            return self._extract_plain_text(payload)
+
         try:
             # Try to parse as JSON first
             try:
                 self.logger.debug(
-                    f"Attempting to parse JSON payload: {payload[:100]}..."
+                    "Attempting to parse JSON payload: %.100r...", payload
                 )
-                data = json.loads(payload)
-                self.logger.debug(f"Successfully parsed JSON: {data}")
-
-                # Use JSONPath to extract content
-                jsonpath_expr = parse(self.config.subscribe_path)
-                matches = jsonpath_expr.find(data)
+                data = jsonutil.loads(payload)
+                self.logger.debug("Successfully parsed JSON: %s", data)
+
+                # Plain "$.key" paths are a dict lookup; anything else is
+                # evaluated with the JSONPath expression parsed at config time
+                path_key = self.config.subscribe_path_key
+                if path_key is not None:
+                    found = isinstance(data, dict) and path_key in data
+                    value = data[path_key] if found else None
+                else:
+                    matches = self.config.subscribe_path_expr.find(data)
+                    found = bool(matches)
+                    value = matches[0].value if found else None
 
-                if matches:
-                    extracted_value = str(matches[0].value)
+                if found:
+                    extracted_value = str(value)
                     self.logger.debug(
-                        f"JSONPath '{self.config.subscribe_path}' matched: {extracted_value}"
+                        "JSONPath '%s' matched: %s",
+                        self.config.subscribe_path,
+                        extracted_value,
                     )
                     return extracted_value
                 else:
@@ -155,42 +328,42 @@ class MQTTClient:
                         f"Available keys: {list(data.keys()) if isinstance(data, dict) else 'N/A'}"
                     )
                     return None
-            except json.JSONDecodeError as e:
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
                 # If not JSON, treat as plain text
                 self.logger.debug(
-                    f"JSON decode failed: {e}, payload: {payload[:200]}..."
+                    "JSON decode failed: %s, payload: %.200r...", e, payload
                 )
-                if (
-                    self.config.subscribe_path == "$.text"
-                    or self.config.subscribe_path == "$"
-                ):
-                    return payload
-                else:
-                    self.logger.warning(
-                        f"Message is not JSON but JSON path is specified: "
-                        f"{self.config.subscribe_path}. Payload: {payload[:100]}..."
-                    )
-                    return None
+                return self._extract_plain_text(payload)
 
         except Exception as e:
             self.logger.error(f"Error extracting text content: {e}")
             return None
 
+    def _extract_plain_text(self, payload: bytes) -> Optional[str]:
+        """Return a non-JSON payload when the path allows plain text."""
+        if self.config.subscribe_path == "$.text":
+            return payload.decode("utf-8", "replace")
+        self.logger.warning(
+            f"Message is not JSON but JSON path is specified: "
+            f"{self.config.subscribe_path}. Payload: {payload[:100]!r}..."
+        )
+        return None
+
     def _should_trigger_ai(self, message: str) -> bool:
         """Check if message contains the trigger pattern."""
-        try:
-            pattern_match = re.search(self.config.trigger_pattern, message)
-            if pattern_match:
-                self.logger.debug(
-                    f"Trigger pattern '{self.config.trigger_pattern}' found in message"
-                )
-                return True
-            return False
-        except re.error as e:
+        trigger_regex = self.config.trigger_regex
+        if trigger_regex is None:
             self.logger.error(
-                f"Invalid trigger pattern regex '{self.config.trigger_pattern}': {e}"
+                f"Invalid trigger pattern regex '{self.config.trigger_pattern}'"
+            )
+            return True
+        if trigger_regex.search(message):
+            self.logger.debug(
+                "Trigger pattern '%s' found in message",
+                self.config.trigger_pattern,
             )
             return True
+        return False
 
     def _on_subscribe(
         self, client: mqtt.Client, userdata: Any, mid: int, granted_qos: int
@@ -202,7 +375,7 @@ class MQTTClient:
         self, client: mqtt.Client, userdata: Any, mid: int
     ) -> None:
         """Handle publish confirmation."""
-        self.logger.debug(f"Message published with mid: {mid}")
+        self.logger.debug("Message published with mid: %s", mid)
 
     def connect(self) -> None:
         """Connect to MQTT broker."""
@@ -301,20 +474,43 @@ class MQTTClient:
             return
 
         try:
+            # Sanitize once up front so chunks are cut from the final text
+            text = self._sanitize_response(response)
+
             # Check if chunking is enabled and response needs chunking
             if (
                 self.config.message_max_length
-                and len(response) > self.config.message_max_length
+                and len(text) > self.config.message_max_length
             ):
-                self._publish_chunked_response(response)
+                self._publish_chunked_response(text)
             else:
                 # Format and publish single response
-                formatted_response = self._format_response(response)
-                self._publish_single_message(formatted_response)
+                self._publish_single_message(self._apply_template(text))
 
         except Exception as e:
             self.logger.error(f"Error publishing response: {e}")
 
+    def publish_fragment(self, text: str) -> None:
+        """Publish part of a streamed response exactly as generated.
+
+        Subscribers join fragments back together, so sanitizing, templating
+        or chunking each one would corrupt the reassembled response.
+        """
+        if not self.client or not self.connected:
+            self.logger.error("Cannot publish: not connected to MQTT broker")
+            return
+
+        result = self.client.publish(
+            self.config.publish_topic,
+            text,
+            qos=self.config.qos,
+            retain=self.config.retain,
+        )
+        if result.rc != _MQTT_OK:
+            self.logger.error(
+                f"Failed to publish response fragment: {result.rc}"
+            )
+
     def _publish_single_message(self, formatted_response: str) -> None:
         """Publish a single message."""
         if not self.client:
@@ -328,23 +524,20 @@ class MQTTClient:
             retain=self.config.retain,
         )
 
-        if result.rc == mqtt.MQTT_ERR_SUCCESS:
+        if result.rc == _MQTT_OK:
             self.logger.info(
                 f"Response published to {self.config.publish_topic}"
             )
-            self.logger.debug(f"Published response: {formatted_response}")
+            self.logger.debug("Published response: %s", formatted_response)
         else:
             self.logger.error(f"Failed to publish response: {result.rc}")
 
     def _publish_chunked_response(self, response: str) -> None:
-        """Publish response as multiple chunked messages."""
+        """Publish an already-sanitized response as chunked messages."""
         if not self.config.message_max_length:
             raise ValueError("message_max_length must be set for chunking")
 
-        # Calculate chunk size (reserve space for "X/Y: " prefix)
-        prefix_space = 10  # Conservative estimate for "999/999: "
-        chunk_size = self.config.message_max_length - prefix_space
-
+        chunk_size = self._chunk_size
         if chunk_size <= 0:
             self.logger.error(
                 "Message max length too small for chunking (need space for prefix)"
@@ -360,31 +553,34 @@ class MQTTClient:
             f"(max length: {self.config.message_max_length})"
         )
 
-        # Publish each chunk with prefix
-        for i, chunk in enumerate(chunks, 1):
-            prefixed_chunk = f"{i}/{total_chunks}: {chunk}"
-            formatted_chunk = self._format_response(prefixed_chunk)
-
-            if not self.client:
-                self.logger.error("MQTT client not available")
-                return
-
-            result = self.client.publish(
-                self.config.publish_topic,
-                formatted_chunk,
-                qos=self.config.qos,
-                retain=self.config.retain,
-            )
+        if not self.client:
+            self.logger.error("MQTT client not available")
+            return
 
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                self.logger.debug(
-                    f"Published chunk {i}/{total_chunks} to {self.config.publish_topic}"
-                )
+        # Format every chunk up front so the publishes go out back-to-back
+        formatted_chunks = [
+            self._apply_template(f"{i}/{total_chunks}: {chunk}")
+            for i, chunk in enumerate(chunks, 1)
+        ]
+
+        publish = self.client.publish
+        topic = self.config.publish_topic
+        qos = self.config.qos
+        retain = self.config.retain
+        published = 0
+        for i, formatted_chunk in enumerate(formatted_chunks, 1):
+            result = publish(topic, formatted_chunk, qos=qos, retain=retain)
+            if result.rc == _MQTT_OK:
+                published += 1
             else:
                 self.logger.error(
                     f"Failed to publish chunk {i}/{total_chunks}: {result.rc}"
                 )
 
+        self.logger.info(
+            "Published %d/%d chunks to %s", published, total_chunks, topic
+        )
+
     def _chunk_text(self, text: str, chunk_size: int) -> list:
         """Split text into chunks of specified size, preferring word boundaries."""
         if len(text) <= chunk_size:
@@ -408,10 +604,11 @@ class MQTTClient:
             look_back = min(chunk_size // 5, 50)
             search_start = max(end - look_back, start)
 
-            for i in range(end - 1, search_start - 1, -1):
-                if text[i] in " \n\t.!?;,":
-                    break_point = i + 1
-                    break
+            last_break = max(
+                text.rfind(char, search_start, end) for char in _BREAK_CHARS
+            )
+            if last_break >= 0:
+                break_point = last_break + 1
 
             chunks.append(text[start:break_point].rstrip())
             start = break_point
@@ -420,151 +617,50 @@ class MQTTClient:
 
     def _format_response(self, response: str) -> str:
         """Format response using the configured template."""
-        try:
-            # First sanitize the response if configured
-            sanitized_response = self._sanitize_response(response)
-            template = self.config.publish_template
-            self.logger.debug(
-                f"Formatting response with template: {template} (type: {type(template)})"
-            )
+        return self._apply_template(self._sanitize_response(response))
 
-            if isinstance(template, str):
-                # Check if string template is actually JSON
-                if template.strip().startswith(
-                    "{"
-                ) and template.strip().endswith("}"):
-                    try:
-                        # Try to parse as JSON template with placeholder replacement
-                        # First, replace the placeholder with a safe temporary marker
-                        temp_template = template.replace(
-                            "{response}", "__RESPONSE_PLACEHOLDER__"
-                        )
-                        json_template = json.loads(temp_template)
-
-                        # Now recursively replace placeholders in the parsed JSON
-                        def replace_placeholders(obj: Any) -> Any:
-                            if isinstance(obj, str):
-                                return obj.replace(
-                                    "__RESPONSE_PLACEHOLDER__",
-                                    sanitized_response,
-                                )
-                            elif isinstance(obj, dict):
-                                return {
-                                    k: replace_placeholders(v)
-                                    for k, v in obj.items()
-                                }
-                            elif isinstance(obj, list):
-                                return [
-                                    replace_placeholders(item) for item in obj
-                                ]
-                            else:
-                                return obj
-
-                        formatted_json = replace_placeholders(json_template)
-                        formatted_response = json.dumps(formatted_json)
-                        self.logger.debug(
-                            f"JSON template result: {formatted_response}"
-                        )
-                        return formatted_response
-                    except json.JSONDecodeError:
-                        # Fall through to simple string template
-                        pass
-
-                # Simple string template
-                formatted = template.format(response=sanitized_response)
-                self.logger.debug(f"String template result: {formatted}")
-                return formatted
-            elif isinstance(template, dict):
-                # JSON template - replace placeholders in the dict
-                formatted_template = json.dumps(template)
-                self.logger.debug(
-                    f"JSON template string: {formatted_template}"
-                )
-                formatted_response = formatted_template.format(
-                    response=sanitized_response
-                )
-                self.logger.debug(
-                    f"JSON template result: {formatted_response}"
-                )
-                return formatted_response
-            else:
-                # Fallback to plain response
-                self.logger.debug(  # type: ignore[unreachable]
-                    f"Using fallback (plain response): {sanitized_response}"
-                )
-                return sanitized_response
+    def _apply_template(self, text: str) -> str:
+        """Render already-sanitized text with the configured template."""
+        try:
+            formatted = self._render_template(text)
+            self.logger.debug("Template result: %s", formatted)
+            return formatted
 
         except Exception as e:
             self.logger.error(f"Error formatting response: {e}")
-            return response
+            return text
 
     def _sanitize_response(self, response: str) -> str:
         """Sanitize response text by removing formatting, unicode, emojis."""
         if not self.config.sanitize_response:
             return response
         try:
-            # Remove emojis and other symbols
-            # This regex matches most emoji ranges
-            emoji_pattern = re.compile(
-                "["
-                "\U0001f600-\U0001f64f"  # emoticons
-                "\U0001f300-\U0001f5ff"  # symbols & pictographs
-                "\U0001f680-\U0001f6ff"  # transport & map symbols
-                "\U0001f1e0-\U0001f1ff"  # flags (iOS)
-                "\U00002500-\U00002bef"  # chinese char
-                "\U00002702-\U000027b0"
-                "\U000024c2-\U0001f251"
-                "\U0001f926-\U0001f937"
-                "\U00010000-\U0010ffff"
-                "\u2640-\u2642"
-                "\u2600-\u2b55"
-                "\u200d"
-                "\u23cf"
-                "\u23e9"
-                "\u231a"
-                "\ufe0f"  # dingbats
-                "\u3030"
-                "]+",
-                re.UNICODE,
-            )
-
-            # Remove emojis
-            text = emoji_pattern.sub(r"", response)
-
-            # Remove extra whitespace and normalize newlines
-            text = re.sub(r"\s+", " ", text)  # Multiple spaces to single space
-            text = re.sub(r"\n+", " ", text)  # Newlines to spaces
-            text = re.sub(r"\r+", " ", text)  # Carriage returns to spaces
-            text = re.sub(r"\t+", " ", text)  # Tabs to spaces
+            # Collapse spaces, newlines, carriage returns and tabs
+            text = _WHITESPACE_PATTERN.sub(" ", response)
 
             # Remove XML-like tags (including self-closing tags)
-            text = re.sub(r"<[^>]*>", "", text)  # Remove all XML/HTML tags
+            text = _TAG_PATTERN.sub("", text)
 
             # Remove markdown formatting
-            text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)  # **bold**
-            text = re.sub(r"\*(.*?)\*", r"\1", text)  # *italic*
-            text = re.sub(r"_(.*?)_", r"\1", text)  # _italic_
-            text = re.sub(r"`(.*?)`", r"\1", text)  # `code`
-            text = re.sub(r"#{1,6}\s*", "", text)  # # headers
-            text = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", text)  # [text](link)
+            for pattern, replacement in _MARKDOWN_PATTERNS:
+                text = pattern.sub(replacement, text)
 
-            # Normalize unicode characters to ASCII equivalents where possible
-            text = unicodedata.normalize("NFKD", text)
-            text = text.encode("ascii", "ignore").decode("ascii")
+            # Normalize unicode characters to ASCII equivalents where possible;
+            # emoji and other symbols have none and are dropped here. ASCII
+            # text is already in that form, so skip the round trip for it
+            if not text.isascii():
+                text = unicodedata.normalize("NFKD", text)
+                text = text.encode("ascii", "ignore").decode("ascii")
 
             # Remove any remaining control characters
-            text = "".join(
-                char for char in text if unicodedata.category(char) != "Cc"
-            )
+            text = text.translate(_CONTROL_CHARS)
 
-            # Clean up extra spaces created by removals
+            # Clean up extra spaces created by removals; joining the split
+            # words also leaves no leading or trailing whitespace
             text = " ".join(text.split())
 
-            # Strip leading/trailing whitespace
-            text = text.strip()
-
             self.logger.debug(
-                f"Sanitized response: '{response[:50]}...' -> '{text[:50]}...'"
+                "Sanitized response: '%.50s...' -> '%.50s...'", response, text
             )
             return text
 
@@ -1,13 +1,49 @@
 """OpenAI-compatible API client for the MQTT-LLM bridge."""
 
+import asyncio
 import json
 import logging
-from typing import Optional
+import time
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
 
 import aiohttp
 
+from . import __version__, jsonutil
+from .cache import ResponseCache
 from .config import OpenAIConfig
 
+# Identifies the bridge to API providers
+_USER_AGENT = f"mqtt-llm/{__version__}"
+
+
+class OpenAIError(Exception):
+    """Raised when a request to the OpenAI-compatible API fails."""
+
+
+# Seconds a fetched model list is reused by list_models(); providers change
+# their catalogue far less often than that
+MODELS_CACHE_TTL = 60.0
+
+
+async def _sse_deltas(lines: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Yield the content deltas from a streamed chat completion.
+
+    The body is server-sent events: one "data: {...}" line per delta,
+    ending with "data: [DONE]".
+    """
+    async for line in lines:
+        line = line.strip()
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            break
+        choices = jsonutil.loads(data).get("choices") or []
+        if choices:
+            content = (choices[0].get("delta") or {}).get("content")
+            if content:
+                yield content
+
 
 class OpenAIClient:
     """Client for interacting with OpenAI-compatible APIs."""
@@ -17,6 +53,40 @@ class OpenAIClient:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.session: Optional[aiohttp.ClientSession] = None
+        self._model_warm_up: Optional[asyncio.Task] = None
+
+        # URLs, the system message and the fixed payload fields depend only
+        # on the frozen config, so build them once
+        self._base_url = config.api_url.rstrip("/")
+        self._chat_url = f"{self._base_url}/v1/chat/completions"
+        self._models_url = f"{self._base_url}/v1/models"
+        self._system_message: Optional[dict] = (
+            {"role": "system", "content": config.system_prompt}
+            if config.system_prompt
+            else None
+        )
+        self._models_cache: Optional[Tuple[float, list]] = None
+        # Sent with model-list requests so unchanged lists come back as 304
+        self._models_validators: dict = {}
+        self._headers = {
+            "Content-Type": "application/json",
+            "User-Agent": _USER_AGENT,
+        }
+        if config.api_key:
+            self._headers["Authorization"] = f"Bearer {config.api_key}"
+        self._payload_base: dict = {
+            "model": config.model,
+            "max_tokens": config.max_tokens,
+        }
+        if config.temperature is not None:
+            self._payload_base["temperature"] = config.temperature
+        # Model and system prompt are fixed per client, so responses are
+        # cached by user message alone
+        self.cache: Optional[ResponseCache] = (
+            ResponseCache(config.cache_max_entries, config.cache_ttl)
+            if config.cache_max_entries
+            else None
+        )
 
     async def __aenter__(self) -> "OpenAIClient":
         """Async context manager entry."""
@@ -30,33 +100,103 @@ class OpenAIClient:
         await self.disconnect()
 
     async def connect(self) -> None:
-        """Initialize HTTP session for API requests."""
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "mqtt-llm/0.1.0",
-        }
+        """Initialize the pooled HTTP session for API requests.
 
-        if self.config.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api_key}"
+        The session is created once and reused for every request so that
+        keep-alive connections are shared across MQTT messages.
+        """
+        if self.session and not self.session.closed:
+            return
 
         timeout = aiohttp.ClientTimeout(total=self.config.timeout)
         self.session = aiohttp.ClientSession(
-            headers=headers,
+            headers=self._headers,
             timeout=timeout,
-            connector=aiohttp.TCPConnector(limit=10),
+            # Keep idle sockets and resolved addresses long enough to
+            # span the gaps between MQTT messages
+            connector=aiohttp.TCPConnector(
+                limit=self.config.max_concurrency,
+                limit_per_host=self.config.max_concurrency,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+            ),
         )
 
         self.logger.info(
             f"OpenAI client initialized for {self.config.api_url}"
         )
 
+        # Load the model in the background while the bridge starts up
+        if self.config.warm_up_model:
+            self._model_warm_up = asyncio.create_task(self.warm_up_model())
+
+    async def warm_up(self, connections: int = 2) -> None:
+        """Pre-open keep-alive connections to the API host.
+
+        Issues a few concurrent HEAD requests through the pooled session
+        so DNS, TCP and TLS setup happen before the first message arrives.
+        Failures are ignored; the real request will surface any problem.
+        """
+        if not self.session:
+            return
+
+        url = self._base_url
+
+        async def _head() -> None:
+            if not self.session:
+                return
+            async with self.session.head(url) as response:
+                await response.read()
+
+        results = await asyncio.gather(
+            *(_head() for _ in range(connections)), return_exceptions=True
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            self.logger.debug(f"Connection warm-up failed: {failures[0]}")
+        else:
+            self.logger.debug(f"Warmed {connections} connections to {url}")
+
+    async def warm_up_model(self) -> None:
+        """Ask for a single token so a lazily-loading backend loads the model.
+
+        Servers such as Ollama only load a model on its first request, so
+        this moves that delay to startup. Failures are ignored.
+        """
+        if not self.session:
+            return
+
+        payload = {
+            **self._payload_base,
+            "messages": [{"role": "user", "content": "Hi"}],
+            "max_tokens": 1,
+            "stream": False,
+        }
+        try:
+            async with self.session.post(
+                self._chat_url, data=jsonutil.dumps_bytes(payload)
+            ) as response:
+                await response.read()
+            self.logger.debug(f"Model {self.config.model} warmed up")
+        except Exception as e:
+            self.logger.debug(f"Model warm-up failed: {e}")
+
     async def disconnect(self) -> None:
         """Close HTTP session."""
+        if self._model_warm_up:
+            self._model_warm_up.cancel()
+            self._model_warm_up = None
         if self.session:
             await self.session.close()
             self.session = None
             self.logger.info("OpenAI client session closed")
 
+    def _user_messages(self, message: str) -> list:
+        """Return the chat messages for a single user message."""
+        if self._system_message:
+            return [self._system_message, {"role": "user", "content": message}]
+        return [{"role": "user", "content": message}]
+
     async def generate_response(self, message: str) -> str:
         """Generate response from OpenAI-compatible API."""
         if not self.session:
@@ -64,154 +204,164 @@ class OpenAIClient:
                 "OpenAI client not connected. Call connect() first."
             )
 
-        try:
-            # Prepare messages for chat completions format
-            messages = []
-            if self.config.system_prompt:
-                messages.append(
-                    {"role": "system", "content": self.config.system_prompt}
+        if self.cache is not None:
+            cached = self.cache.get(message)
+            if cached is not None:
+                self.logger.info(
+                    f"Using cached response for model {self.config.model}"
                 )
-            messages.append({"role": "user", "content": message})
-
-            # Prepare the request payload for OpenAI format
-            payload = {
-                "model": self.config.model,
-                "messages": messages,
-                "max_tokens": self.config.max_tokens,
-                "stream": False,
-            }
-
-            # Add temperature if configured
-            if (
-                hasattr(self.config, "temperature")
-                and self.config.temperature is not None
-            ):
-                payload["temperature"] = self.config.temperature
-
-            # Make API request to chat/completions endpoint
-            url = f"{self.config.api_url.rstrip('/')}/v1/chat/completions"
-            self.logger.debug(f"Making request to: {url}")
-            self.logger.debug(
-                f"Request payload: {json.dumps(payload, indent=2)}"
-            )
+                return cached
 
-            async with self.session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    choices = data.get("choices", [])
-                    if choices and len(choices) > 0:
-                        generated_response: str = (
-                            choices[0].get("message", {}).get("content", "")
-                        )
-                    else:
-                        generated_response = ""
+        # Prepare the request payload for OpenAI format
+        payload = {
+            **self._payload_base,
+            "messages": self._user_messages(message),
+            "stream": False,
+        }
+        generated_response = await self._complete(payload, "OpenAI API")
 
-                    self.logger.info(
-                        f"Generated response for model {self.config.model}"
-                    )
-                    self.logger.debug(f"Response: {generated_response}")
+        self.logger.info(f"Generated response for model {self.config.model}")
+        self.logger.debug("Response: %s", generated_response)
 
-                    return generated_response
-                else:
+        if self.cache is not None and generated_response:
+            self.cache.put(message, generated_response)
+
+        return generated_response
+
+    async def _complete(self, payload: dict, api: str) -> str:
+        """POST a chat completion and return the first choice's content.
+
+        ``api`` names the API in log and error messages, e.g. "OpenAI API".
+        """
+        if not self.session:
+            raise RuntimeError(
+                "OpenAI client not connected. Call connect() first."
+            )
+
+        # Make API request to chat/completions endpoint
+        url = self._chat_url
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Making {api} request to: {url}")
+            self.logger.debug(
+                f"Request payload: {jsonutil.dumps_pretty(payload)}"
+            )
+
+        try:
+            async with self.session.post(
+                url, data=jsonutil.dumps_bytes(payload)
+            ) as response:
+                if response.status != 200:
                     error_text = await response.text()
-                    self.logger.error(
-                        f"OpenAI API error {response.status}: {error_text}"
-                    )
-                    raise Exception(
-                        f"OpenAI API request failed with status "
+                    raise OpenAIError(
+                        f"{api} request failed with status "
                         f"{response.status}: {error_text}"
                     )
+                data = jsonutil.loads(await response.read())
 
         except aiohttp.ClientError as e:
-            self.logger.error(f"HTTP client error: {e}")
-            raise Exception(f"Failed to connect to OpenAI API: {e}")
+            raise OpenAIError(f"Failed to connect to OpenAI API: {e}") from e
+        except asyncio.TimeoutError as e:
+            raise OpenAIError(
+                f"OpenAI API request timed out after {self.config.timeout}s"
+            ) from e
         except json.JSONDecodeError as e:
-            self.logger.error(f"JSON decode error: {e}")
-            raise Exception(f"Invalid JSON response from OpenAI API: {e}")
-        except Exception as e:
-            self.logger.error(f"Unexpected error in generate_response: {e}")
-            raise
+            raise OpenAIError(
+                f"Invalid JSON response from OpenAI API: {e}"
+            ) from e
+
+        choices = data.get("choices", [])
+        if not choices:
+            return ""
+        content: str = choices[0].get("message", {}).get("content", "")
+        return content
+
+    async def generate_batch(self, messages: list) -> list:
+        """Generate responses for several messages concurrently.
+
+        Requests share the session's connection pool, so at most
+        max_concurrency are in flight; failures are returned in place.
+        """
+        return await asyncio.gather(
+            *(self.generate_response(message) for message in messages),
+            return_exceptions=True,
+        )
 
-    async def chat_response(self, messages: list) -> str:
-        """Generate chat response from OpenAI-compatible API."""
+    async def generate_response_stream(
+        self, message: str
+    ) -> AsyncIterator[str]:
+        """Stream a response from the API, yielding content as it arrives."""
         if not self.session:
             raise RuntimeError(
                 "OpenAI client not connected. Call connect() first."
             )
 
-        try:
-            # Add system message if provided and not already present
-            formatted_messages = list(messages)
-            if self.config.system_prompt:
-                # Check if system message already exists
-                has_system = any(
-                    msg.get("role") == "system" for msg in formatted_messages
-                )
-                if not has_system:
-                    system_message = {
-                        "role": "system",
-                        "content": self.config.system_prompt,
-                    }
-                    formatted_messages.insert(0, system_message)
-
-            # Prepare the request payload for OpenAI format
-            payload = {
-                "model": self.config.model,
-                "messages": formatted_messages,
-                "max_tokens": self.config.max_tokens,
-                "stream": False,
-            }
-
-            # Add temperature if configured
-            if (
-                hasattr(self.config, "temperature")
-                and self.config.temperature is not None
-            ):
-                payload["temperature"] = self.config.temperature
-
-            # Make API request
-            url = f"{self.config.api_url.rstrip('/')}/v1/chat/completions"
-            self.logger.debug(f"Making chat request to: {url}")
-            self.logger.debug(
-                f"Request payload: {json.dumps(payload, indent=2)}"
-            )
-
-            async with self.session.post(url, json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    choices = data.get("choices", [])
-                    if choices and len(choices) > 0:
-                        generated_response: str = (
-                            choices[0].get("message", {}).get("content", "")
-                        )
-                    else:
-                        generated_response = ""
+        payload = {
+            **self._payload_base,
+            "messages": self._user_messages(message),
+            "stream": True,
+        }
 
-                    self.logger.info(
-                        f"Generated chat response for model {self.config.model}"
-                    )
-                    self.logger.debug(f"Response: {generated_response}")
+        url = self._chat_url
+        self.logger.debug("Making streaming request to: %s", url)
 
-                    return generated_response
-                else:
+        try:
+            async with self.session.post(
+                url, data=jsonutil.dumps_bytes(payload)
+            ) as response:
+                if response.status != 200:
                     error_text = await response.text()
-                    self.logger.error(
-                        f"OpenAI chat API error {response.status}: {error_text}"
-                    )
-                    raise Exception(
-                        f"OpenAI chat API request failed with status "
+                    raise OpenAIError(
+                        f"OpenAI API request failed with status "
                         f"{response.status}: {error_text}"
                     )
 
+                async for content in _sse_deltas(response.content):
+                    yield content
+
+            self.logger.info(
+                f"Streamed response for model {self.config.model}"
+            )
+
         except aiohttp.ClientError as e:
-            self.logger.error(f"HTTP client error: {e}")
-            raise Exception(f"Failed to connect to OpenAI API: {e}")
+            raise OpenAIError(f"Failed to connect to OpenAI API: {e}") from e
+        except asyncio.TimeoutError as e:
+            raise OpenAIError(
+                f"OpenAI API request timed out after {self.config.timeout}s"
+            ) from e
         except json.JSONDecodeError as e:
-            self.logger.error(f"JSON decode error: {e}")
-            raise Exception(f"Invalid JSON response from OpenAI API: {e}")
-        except Exception as e:
-            self.logger.error(f"Unexpected error in chat_response: {e}")
-            raise
+            raise OpenAIError(
+                f"Invalid JSON response from OpenAI API: {e}"
+            ) from e
+
+    async def chat_response(self, messages: list) -> str:
+        """Generate chat response from OpenAI-compatible API."""
+        if not self.session:
+            raise RuntimeError(
+                "OpenAI client not connected. Call connect() first."
+            )
+
+        # Add system message if provided and not already present; the
+        # caller's list is only copied when a message is prepended
+        formatted_messages = messages
+        if self._system_message and not any(
+            msg.get("role") == "system" for msg in messages
+        ):
+            formatted_messages = [self._system_message, *messages]
+
+        # Prepare the request payload for OpenAI format
+        payload = {
+            **self._payload_base,
+            "messages": formatted_messages,
+            "stream": False,
+        }
+        generated_response = await self._complete(payload, "OpenAI chat API")
+
+        self.logger.info(
+            f"Generated chat response for model {self.config.model}"
+        )
+        self.logger.debug("Response: %s", generated_response)
+
+        return generated_response
 
     async def health_check(self) -> bool:
         """Check if OpenAI-compatible API is available and responsive."""
@@ -223,16 +373,19 @@ class OpenAIClient:
 
         try:
             # Try to get models list from OpenAI-compatible endpoint
-            base_url = self.config.api_url.rstrip("/")
-            url = f"{base_url}/v1/models"
+            url = self._models_url
             self.logger.debug(f"Health check URL: {url}")
 
-            async with self.session.get(url) as response:
+            async with self.session.get(
+                url, headers=self._models_validators
+            ) as response:
                 self.logger.debug(f"Health check status: {response.status}")
 
-                if response.status == 200:
+                if response.status == 304 and self._models_cache:
+                    models = self._reuse_models(self._models_cache)
+                elif response.status == 200:
                     try:
-                        data = await response.json()
+                        data = jsonutil.loads(await response.read())
                     except json.JSONDecodeError as e:
                         self.logger.warning(
                             f"Failed to parse models response as JSON: {e}"
@@ -240,45 +393,12 @@ class OpenAIClient:
                         # If we can't parse the response but got 200, assume healthy
                         return True
 
-                    if data and isinstance(data, dict):
-                        models = data.get("data", [])
-                        model_names = []
-                        for model in models:
-                            if model and isinstance(model, dict):
-                                model_id = model.get("id")
-                                if model_id:
-                                    model_names.append(model_id)
-                    else:
-                        model_names = []
-
-                    self.logger.info(
-                        f"OpenAI API is healthy. Available models: {len(model_names)} found"
-                    )
-                    self.logger.debug(
-                        f"Model list: {model_names[:10]}..."
-                    )  # Show first 10
-
-                    # If no models returned, assume healthy (some APIs might not support model listing)
-                    if not model_names:
-                        self.logger.info(
-                            "No models returned, assuming API is healthy"
-                        )
-                        return True
-
-                    # Check if configured model is available (case-insensitive partial match)
-                    model_found = any(
-                        self.config.model.lower() in model_name.lower()
-                        or model_name.lower() in self.config.model.lower()
-                        for model_name in model_names
+                    models = (
+                        data.get("data") or []
+                        if isinstance(data, dict)
+                        else []
                     )
-
-                    if not model_found:
-                        self.logger.warning(
-                            f"Configured model '{self.config.model}' not found "
-                            f"in available models. Will attempt to use anyway."
-                        )
-
-                    return True
+                    self._store_models(response, models)
                 elif response.status == 401:
                     self.logger.error(
                         "API authentication failed. Check your API key."
@@ -303,8 +423,47 @@ class OpenAIClient:
             self.logger.error(f"OpenAI health check unexpected error: {e}")
             return False
 
+        model_names = [
+            model["id"]
+            for model in models
+            if isinstance(model, dict) and model.get("id")
+        ]
+
+        self.logger.info(
+            f"OpenAI API is healthy. Available models: {len(model_names)} found"
+        )
+        self.logger.debug(
+            f"Model list: {model_names[:10]}..."
+        )  # Show first 10
+
+        # If no models returned, assume healthy (some APIs might not support model listing)
+        if not model_names:
+            self.logger.info("No models returned, assuming API is healthy")
+            return True
+
+        # Check if configured model is available (case-insensitive partial match)
+        configured = self.config.model.lower()
+        model_found = any(
+            configured in name or name in configured
+            for name in map(str.lower, model_names)
+        )
+
+        if not model_found:
+            self.logger.warning(
+                f"Configured model '{self.config.model}' not found "
+                f"in available models. Will attempt to use anyway."
+            )
+
+        return True
+
     async def list_models(self) -> list:
         """List available models from OpenAI-compatible API."""
+        # Reuse a list fetched here or by health_check() within the TTL
+        if self._models_cache is not None:
+            fetched_at, models = self._models_cache
+            if time.monotonic() - fetched_at < MODELS_CACHE_TTL:
+                return list(models)
+
         if not self.session:
             await self.connect()
 
@@ -312,20 +471,52 @@ class OpenAIClient:
             raise RuntimeError("HTTP session not available")
 
         try:
-            url = f"{self.config.api_url.rstrip('/')}/v1/models"
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
+            url = self._models_url
+            async with self.session.get(
+                url, headers=self._models_validators
+            ) as response:
+                if response.status == 304 and self._models_cache:
+                    return list(self._reuse_models(self._models_cache))
+                elif response.status == 200:
+                    data = jsonutil.loads(await response.read())
                     models = (
-                        data.get("data", [])
-                        if data and isinstance(data, dict)
+                        data.get("data") or []
+                        if isinstance(data, dict)
                         else []
                     )
-                    return models  # type: ignore[no-any-return]
+                    self._store_models(response, models)
+                    return list(models)
                 else:
                     error_text = await response.text()
-                    raise Exception(f"Failed to list models: {error_text}")
+                    raise OpenAIError(f"Failed to list models: {error_text}")
 
-        except Exception as e:
-            self.logger.error(f"Error listing models: {e}")
-            raise
+        except aiohttp.ClientError as e:
+            raise OpenAIError(f"Failed to connect to OpenAI API: {e}") from e
+        except asyncio.TimeoutError as e:
+            raise OpenAIError(
+                f"OpenAI API request timed out after {self.config.timeout}s"
+            ) from e
+        except json.JSONDecodeError as e:
+            raise OpenAIError(
+                f"Invalid JSON response from OpenAI API: {e}"
+            ) from e
+
+    def _store_models(
+        self, response: aiohttp.ClientResponse, models: list
+    ) -> None:
+        """Cache a fetched model list with its conditional-GET validators."""
+        self._models_cache = (time.monotonic(), models)
+        validators = {}
+        etag = response.headers.get("ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = response.headers.get("Last-Modified")
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+        self._models_validators = validators
+
+    def _reuse_models(self, cached: Tuple[float, list]) -> list:
+        """Renew the cached model list after a 304 Not Modified."""
+        models = cached[1]
+        self._models_cache = (time.monotonic(), models)
+        return models
@@ -0,0 +1,31 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from mqtt_llm.config import AppConfig, MQTTConfig, OpenAIConfig
+
+# Config models are frozen, so one instance is shared by every test
+
+
+@pytest.fixture(scope="session")
+def mqtt_config() -> MQTTConfig:
+    """Return a valid MQTT configuration."""
+    return MQTTConfig(
+        broker="test.mqtt.com",
+        subscribe_topic="input/test",
+        publish_topic="output/test",
+    )
+
+
+@pytest.fixture(scope="session")
+def openai_config() -> OpenAIConfig:
+    """Return a valid OpenAI configuration."""
+    return OpenAIConfig(model="test-model")
+
+
+@pytest.fixture(scope="session")
+def app_config(
+    mqtt_config: MQTTConfig, openai_config: OpenAIConfig
+) -> AppConfig:
+    """Return a valid application configuration."""
+    return AppConfig(mqtt=mqtt_config, openai=openai_config)
@@ -0,0 +1,299 @@
+"""Tests for the bridge's message processing and lifecycle."""
+
+import asyncio
+import signal
+import threading
+import time
+from typing import Any, AsyncIterator, List, Optional, cast
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mqtt_llm import bridge as bridge_module
+from mqtt_llm.bridge import BridgeStartupError, MQTTLLMBridge
+from mqtt_llm.config import AppConfig, MQTTConfig, OpenAIConfig
+from mqtt_llm.mqtt_client import MQTTClient
+
+
+class _StubAPI:
+    """API client stand-in that echoes messages after a delay."""
+
+    def __init__(self, delay: float = 0.0, healthy: bool = True) -> None:
+        """Set the reply delay and the health check result."""
+        self.delay = delay
+        self.healthy = healthy
+        self.active = 0
+        self.peak = 0
+        self.disconnected = False
+        self.deltas: List[str] = []
+
+    async def connect(self) -> None:
+        """Connect nothing."""
+
+    async def warm_up(self) -> None:
+        """Warm nothing."""
+
+    async def health_check(self) -> bool:
+        """Return the configured health."""
+        return self.healthy
+
+    async def generate_response(self, message: str) -> str:
+        """Reply to a message, tracking how many replies overlap."""
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return f"reply to {message}"
+
+    async def generate_response_stream(
+        self, message: str
+    ) -> AsyncIterator[str]:
+        """Stream the reply to a message as its configured deltas."""
+        for delta in self.deltas:
+            yield delta
+
+    async def disconnect(self) -> None:
+        """Record the disconnect."""
+        self.disconnected = True
+
+
+class _StubMQTT:
+    """MQTT client stand-in that records published responses."""
+
+    def __init__(self) -> None:
+        """Start with nothing published."""
+        self.published: List[str] = []
+        self.threads: List[str] = []
+        self.fragments: List[str] = []
+
+    def publish_response(self, response: str) -> None:
+        """Record a response and the thread that published it."""
+        self.published.append(response)
+        self.threads.append(threading.current_thread().name)
+
+    def publish_fragment(self, text: str) -> None:
+        """Record a streamed fragment."""
+        self.fragments.append(text)
+
+    def disconnect(self) -> None:
+        """Disconnect nothing."""
+
+
+def _bridge(
+    config: AppConfig, api: _StubAPI, mqtt: Optional[_StubMQTT] = None
+) -> MQTTLLMBridge:
+    """Return a bridge wired to stub clients."""
+    bridge = MQTTLLMBridge(config)
+    bridge.openai_client = api  # type: ignore[assignment]
+    bridge.mqtt_client = mqtt  # type: ignore[assignment]
+    return bridge
+
+
+def test_process_messages_drains_queue(app_config: AppConfig) -> None:
+    """Test queued messages are answered and published off the loop."""
+    mqtt = _StubMQTT()
+
+    async def scenario() -> None:
+        bridge = _bridge(app_config, _StubAPI(), mqtt)
+        bridge._worker_task = asyncio.create_task(bridge._process_messages())
+        for i in range(3):
+            bridge._enqueue_message(f"message {i}")
+        await asyncio.wait_for(bridge._message_queue.join(), timeout=1.0)
+        await bridge.stop()
+
+    asyncio.run(scenario())
+
+    assert sorted(mqtt.published) == [
+        "reply to message 0",
+        "reply to message 1",
+        "reply to message 2",
+    ]
+    assert all(name.startswith("mqtt-publish") for name in mqtt.threads)
+
+
+def test_process_messages_bounds_concurrency(
+    mqtt_config: MQTTConfig,
+) -> None:
+    """Test no more than max_concurrency messages are handled at once."""
+    config = AppConfig(
+        mqtt=mqtt_config,
+        openai=OpenAIConfig(model="test-model", max_concurrency=2),
+    )
+    api = _StubAPI(delay=0.01)
+
+    async def scenario() -> None:
+        bridge = _bridge(config, api, _StubMQTT())
+        bridge._worker_task = asyncio.create_task(bridge._process_messages())
+        for i in range(6):
+            bridge._enqueue_message(f"message {i}")
+        await asyncio.wait_for(bridge._message_queue.join(), timeout=1.0)
+        await bridge.stop()
+
+    asyncio.run(scenario())
+
+    assert api.peak == 2
+
+
+def test_stop_awaits_inflight_messages(app_config: AppConfig) -> None:
+    """Test stop() lets messages already being handled finish."""
+    mqtt = _StubMQTT()
+    api = _StubAPI(delay=0.05)
+
+    async def scenario() -> None:
+        bridge = _bridge(app_config, api, mqtt)
+        bridge._worker_task = asyncio.create_task(bridge._process_messages())
+        bridge._enqueue_message("slow")
+        # Let the worker pick the message up before stopping
+        await asyncio.sleep(0.01)
+        await bridge.stop()
+
+    asyncio.run(scenario())
+
+    assert mqtt.published == ["reply to slow"]
+    assert api.disconnected
+
+
+def test_run_stops_once_after_startup_error(
+    app_config: AppConfig, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a failed start() raises BridgeStartupError and cleans up once."""
+    api = _StubAPI(healthy=False)
+    monkeypatch.setattr(bridge_module, "OpenAIClient", lambda config: api)
+    bridge = MQTTLLMBridge(app_config)
+
+    with pytest.raises(BridgeStartupError, match="health check failed"):
+        asyncio.run(bridge.start())
+    assert api.disconnected
+    assert bridge.openai_client is None
+
+    bridge = MQTTLLMBridge(app_config)
+    with patch.object(bridge, "stop", wraps=bridge.stop) as stop:
+        with pytest.raises(SystemExit):
+            asyncio.run(bridge.run())
+    stop.assert_called_once()
+
+
+def test_signal_handler_fallback(app_config: AppConfig) -> None:
+    """Test plain signal handlers are used when the loop lacks support."""
+    handlers: dict = {}
+
+    def fake_signal(signum: int, handler: Any) -> None:
+        handlers[signum] = handler
+
+    async def scenario() -> bool:
+        bridge = MQTTLLMBridge(app_config)
+        loop = asyncio.get_running_loop()
+        with (
+            patch.object(
+                loop, "add_signal_handler", side_effect=NotImplementedError
+            ),
+            patch.object(bridge_module.signal, "signal", fake_signal),
+        ):
+            bridge._setup_signal_handlers()
+        handlers[signal.SIGTERM](signal.SIGTERM, None)
+        await asyncio.sleep(0)
+        return bridge.shutdown_event.is_set()
+
+    assert asyncio.run(scenario())
+    assert signal.SIGINT in handlers
+
+
+def test_publish_after_stop(app_config: AppConfig) -> None:
+    """Test the bridge can publish again after being stopped."""
+    mqtt = _StubMQTT()
+    client = cast(MQTTClient, mqtt)
+
+    async def scenario() -> None:
+        async with MQTTLLMBridge(app_config) as bridge:
+            await bridge._publish_response(client, "first")
+        await bridge._publish_response(client, "second")
+        await bridge.stop()
+
+    asyncio.run(scenario())
+
+    assert mqtt.published == ["first", "second"]
+
+
+@pytest.mark.parametrize(
+    "interval,expected",
+    [
+        (0.0, ["Hello", " ", "world,", "\n", "how are you?"]),
+        (60.0, ["Hello world,\nhow are you?"]),
+    ],
+)
+def test_stream_response_fragments(
+    app_config: AppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    interval: float,
+    expected: List[str],
+) -> None:
+    """Test streamed deltas are coalesced and published unaltered."""
+    monkeypatch.setattr(bridge_module, "STREAM_FLUSH_INTERVAL", interval)
+    api = _StubAPI()
+    api.deltas = ["Hello", " ", "world,", "\n", "how are you?"]
+    mqtt = _StubMQTT()
+
+    async def scenario() -> bool:
+        bridge = _bridge(app_config, api)
+        published = await bridge._stream_response(cast(MQTTClient, mqtt), "hi")
+        await bridge.stop()
+        return published
+
+    assert asyncio.run(scenario())
+    assert mqtt.fragments == expected
+    assert mqtt.published == []
+
+
+def test_enqueue_message_drops_when_full(
+    app_config: AppConfig,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test messages beyond the queue bound are dropped with a warning."""
+    monkeypatch.setattr(bridge_module, "MESSAGE_QUEUE_SIZE", 2)
+    bridge = MQTTLLMBridge(app_config)
+
+    for i in range(3):
+        bridge._enqueue_message(f"message {i}")
+
+    assert bridge._message_queue.qsize() == 2
+    assert "Message queue full" in caplog.text
+
+
+def test_concurrent_chunked_responses_stay_contiguous(
+    app_config: AppConfig,
+) -> None:
+    """Test chunks of responses published together do not interleave."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        message_max_length=20,
+    )
+    client = MQTTClient(config)
+    client.connected = True
+    published: List[str] = []
+
+    def publish(topic: str, payload: str, **kwargs: Any) -> Mock:
+        published.append(payload)
+        time.sleep(0.001)  # Give another publisher a chance to interleave
+        return Mock(rc=0)
+
+    client.client = Mock(publish=publish)
+    responses = [f"{letter} " * 40 for letter in "xy"]
+
+    async def scenario() -> None:
+        bridge = MQTTLLMBridge(app_config)
+        await asyncio.gather(
+            *(bridge._publish_response(client, r) for r in responses)
+        )
+        await bridge.stop()
+
+    asyncio.run(scenario())
+
+    # Each chunk body is one response's letter repeated
+    letters = [payload.split(": ", 1)[1][0] for payload in published]
+    half = len(letters) // 2
+    assert len(set(letters[:half])) == 1
+    assert len(set(letters[half:])) == 1
+    assert letters[0] != letters[-1]
@@ -211,3 +211,48 @@ def test_chunking_with_very_small_limit() -> None:
         # Should log error about message being too small for chunking
         mock_error.assert_called_once()
         assert "too small for chunking" in str(mock_error.call_args)
+
+
+def test_format_response_dict_template() -> None:
+    """Test dict templates render the response as JSON values."""
+    import json
+
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        publish_template={"text": "{response}", "tags": ["ai", "{response}"]},
+    )
+    client = MQTTClient(config)
+
+    parsed = json.loads(client._format_response('say "hi"'))
+    assert parsed == {"text": 'say "hi"', "tags": ["ai", 'say "hi"']}
+
+
+def test_publish_chunked_response_sanitizes_once() -> None:
+    """Test sanitization runs once before the response is chunked."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        message_max_length=40,
+        sanitize_response=True,
+    )
+    client = MQTTClient(config)
+    client.connected = True
+
+    mock_mqtt_client = Mock()
+    mock_mqtt_client.publish.return_value.rc = 0  # Success
+    client.client = mock_mqtt_client
+
+    response = "**Bold** text\n\nthat is long enough to be split into chunks."
+    with patch.object(
+        client, "_sanitize_response", wraps=client._sanitize_response
+    ) as sanitize:
+        client.publish_response(response)
+
+    sanitize.assert_called_once_with(response)
+    assert mock_mqtt_client.publish.call_count > 1
+    for call_args in mock_mqtt_client.publish.call_args_list:
+        assert "**" not in call_args[0][1]
+        assert "\n" not in call_args[0][1]
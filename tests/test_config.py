@@ -40,27 +40,86 @@ def test_openai_config_defaults() -> None:
     assert config.temperature is None
 
 
-def test_app_config() -> None:
+def test_app_config(
+    mqtt_config: MQTTConfig, openai_config: OpenAIConfig
+) -> None:
     """Test complete app configuration."""
-    mqtt_config = MQTTConfig(
+    app_config = AppConfig(mqtt=mqtt_config, openai=openai_config)
+    assert app_config.log_level == "INFO"
+
+
+def test_log_level_validation(
+    mqtt_config: MQTTConfig, openai_config: OpenAIConfig
+) -> None:
+    """Test log level validation."""
+    with pytest.raises(ValidationError):
+        AppConfig(mqtt=mqtt_config, openai=openai_config, log_level="INVALID")
+
+
+def test_trigger_regex_compiled_once() -> None:
+    """Test trigger pattern is compiled once and cached on the config."""
+    config = MQTTConfig(
         broker="localhost",
         subscribe_topic="test/input",
         publish_topic="test/output",
+        trigger_pattern=r"@(ai|bot)",
     )
-    openai_config = OpenAIConfig(model="llama3")
+    assert config.trigger_regex is not None
+    assert config.trigger_regex is config.trigger_regex
+    assert config.trigger_regex.search("hey @bot")
 
-    app_config = AppConfig(mqtt=mqtt_config, openai=openai_config)
-    assert app_config.log_level == "INFO"
+
+def test_trigger_regex_invalid_pattern() -> None:
+    """Test invalid trigger pattern yields no compiled regex."""
+    config = MQTTConfig(
+        broker="localhost",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        trigger_pattern="[unclosed",
+    )
+    assert config.trigger_regex is None
 
 
-def test_log_level_validation() -> None:
-    """Test log level validation."""
-    mqtt_config = MQTTConfig(
+def test_subscribe_path_key() -> None:
+    """Test simple JSON paths resolve to a direct key lookup."""
+    config = MQTTConfig(
         broker="localhost",
         subscribe_topic="test/input",
         publish_topic="test/output",
     )
-    openai_config = OpenAIConfig(model="llama3")
+    assert config.subscribe_path_key == "text"
 
+    config = MQTTConfig(
+        broker="localhost",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        subscribe_path="$.message.text",
+    )
+    assert config.subscribe_path_key is None
+    assert config.subscribe_path_expr.find({"message": {"text": "hi"}})
+
+
+def test_derived_values_follow_model_copy(mqtt_config: MQTTConfig) -> None:
+    """Test copies with updated fields do not reuse derived values."""
+    assert mqtt_config.trigger_regex is not None
+    copied = mqtt_config.model_copy(
+        update={"trigger_pattern": "@bot", "subscribe_path": "$.body"}
+    )
+
+    assert copied.trigger_regex is not None
+    assert copied.trigger_regex.pattern == "@bot"
+    assert copied.subscribe_path_key == "body"
+
+
+def test_config_is_frozen() -> None:
+    """Test config models reject mutation and unknown fields."""
+    config = MQTTConfig(
+        broker="localhost",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+    )
     with pytest.raises(ValidationError):
-        AppConfig(mqtt=mqtt_config, openai=openai_config, log_level="INVALID")
+        config.broker = "other"
+
+    with pytest.raises(ValidationError):
+        OpenAIConfig(model="llama3", unknown_option=True)
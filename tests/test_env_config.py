@@ -1,9 +1,80 @@
 """Tests for environment variable configuration."""
 
+import copy
+import pickle
+from typing import Any, Dict
+
 import pytest
 from pydantic import ValidationError
 
-from mqtt_llm.config import AppConfig
+from mqtt_llm.config import AppConfig, MQTTConfig, OpenAIConfig
+
+_ENV_VARS_TO_CLEAR = (
+    "MQTT_BROKER",
+    "MQTT_PORT",
+    "MQTT_USERNAME",
+    "MQTT_PASSWORD",
+    "MQTT_CLIENT_ID",
+    "MQTT_SUBSCRIBE_TOPIC",
+    "MQTT_SUBSCRIBE_PATH",
+    "MQTT_PUBLISH_TOPIC",
+    "MQTT_PUBLISH_TEMPLATE",
+    "MQTT_QOS",
+    "MQTT_RETAIN",
+    "OPENAI_API_URL",
+    "OPENAI_API_KEY",
+    "OPENAI_MODEL",
+    "OPENAI_SYSTEM_PROMPT",
+    "OPENAI_TIMEOUT",
+    "OPENAI_MAX_TOKENS",
+    "LOG_LEVEL",
+)
+
+_SUMMARY_EXPECTED_KEYS = frozenset(
+    {
+        "mqtt_broker",
+        "mqtt_subscribe_topic",
+        "mqtt_publish_topic",
+        "mqtt_qos",
+        "mqtt_retain",
+        "mqtt_trigger_pattern",
+        "openai_api_url",
+        "openai_model",
+        "openai_timeout",
+        "openai_max_tokens",
+        "log_level",
+    }
+)
+
+# Fields checked by the from_env tests, in model_dump include form
+_ENV_CONFIG_FIELDS: Dict[str, Any] = {
+    "mqtt": {
+        "broker",
+        "port",
+        "username",
+        "password",
+        "subscribe_topic",
+        "publish_topic",
+        "qos",
+        "retain",
+    },
+    "openai": {"api_url", "model", "timeout", "max_tokens"},
+    "log_level": True,
+}
+_ENV_DEFAULT_FIELDS: Dict[str, Any] = {
+    "mqtt": {
+        "broker",
+        "port",
+        "username",
+        "password",
+        "subscribe_path",
+        "publish_template",
+        "qos",
+        "retain",
+    },
+    "openai": {"api_url", "timeout", "max_tokens"},
+    "log_level": True,
+}
 
 
 class TestEnvironmentConfig:
@@ -35,145 +106,129 @@ class TestEnvironmentConfig:
 
         config = AppConfig.from_env()
 
-        assert config.mqtt.broker == "test.mqtt.com"
-        assert config.mqtt.port == 8883
-        assert config.mqtt.username == "testuser"
-        assert config.mqtt.password == "testpass"
-        assert config.mqtt.subscribe_topic == "input/test"
-        assert config.mqtt.publish_topic == "output/test"
-        assert config.mqtt.qos == 1
-        assert config.mqtt.retain is True
-        assert config.openai.api_url == "http://test.openai.com:11434"
-        assert config.openai.model == "test-model"
-        assert config.openai.timeout == 45.0
-        assert config.openai.max_tokens == 500
-        assert config.log_level == "DEBUG"
+        assert config.model_dump(include=_ENV_CONFIG_FIELDS) == {
+            "mqtt": {
+                "broker": "test.mqtt.com",
+                "port": 8883,
+                "username": "testuser",
+                "password": "testpass",
+                "subscribe_topic": "input/test",
+                "publish_topic": "output/test",
+                "qos": 1,
+                "retain": True,
+            },
+            "openai": {
+                "api_url": "http://test.openai.com:11434",
+                "model": "test-model",
+                "timeout": 45.0,
+                "max_tokens": 500,
+            },
+            "log_level": "DEBUG",
+        }
 
     def test_from_env_defaults(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test that defaults are used when environment variables are not set."""
         # Clear any existing environment variables
-        env_vars = [
-            "MQTT_BROKER",
-            "MQTT_PORT",
-            "MQTT_USERNAME",
-            "MQTT_PASSWORD",
-            "MQTT_CLIENT_ID",
-            "MQTT_SUBSCRIBE_TOPIC",
-            "MQTT_SUBSCRIBE_PATH",
-            "MQTT_PUBLISH_TOPIC",
-            "MQTT_PUBLISH_TEMPLATE",
-            "MQTT_QOS",
-            "MQTT_RETAIN",
-            "OPENAI_API_URL",
-            "OPENAI_API_KEY",
-            "OPENAI_MODEL",
-            "OPENAI_SYSTEM_PROMPT",
-            "OPENAI_TIMEOUT",
-            "OPENAI_MAX_TOKENS",
-            "LOG_LEVEL",
-        ]
-        for var in env_vars:
+        for var in _ENV_VARS_TO_CLEAR:
             monkeypatch.delenv(var, raising=False)
 
         config = AppConfig.from_env()
 
-        assert config.mqtt.broker == ""
-        assert config.mqtt.port == 1883
-        assert config.mqtt.username is None
-        assert config.mqtt.password is None
-        assert config.mqtt.subscribe_path == "$.text"
-        assert config.mqtt.publish_template == "{response}"
-        assert config.mqtt.qos == 0
-        assert config.mqtt.retain is False
-        assert config.openai.api_url == "http://localhost:11434"
-        assert config.openai.timeout == 30.0
-        assert config.openai.max_tokens == 1000
-        assert config.log_level == "INFO"
-
-    def test_from_env_invalid_port(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Test error handling for invalid MQTT port."""
-        monkeypatch.setenv("MQTT_PORT", "not_a_number")
-
-        with pytest.raises(ValueError, match="Invalid MQTT_PORT value"):
-            AppConfig.from_env()
-
-    def test_from_env_invalid_qos(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Test error handling for invalid MQTT QoS."""
-        monkeypatch.setenv("MQTT_QOS", "invalid")
-
-        with pytest.raises(ValueError, match="Invalid MQTT_QOS value"):
-            AppConfig.from_env()
-
-    def test_from_env_invalid_timeout(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Test error handling for invalid OpenAI timeout."""
-        monkeypatch.setenv("OPENAI_TIMEOUT", "not_a_float")
-
-        with pytest.raises(ValueError, match="Invalid OPENAI_TIMEOUT value"):
-            AppConfig.from_env()
+        assert config.model_dump(include=_ENV_DEFAULT_FIELDS) == {
+            "mqtt": {
+                "broker": "",
+                "port": 1883,
+                "username": None,
+                "password": None,
+                "subscribe_path": "$.text",
+                "publish_template": "{response}",
+                "qos": 0,
+                "retain": False,
+            },
+            "openai": {
+                "api_url": "http://localhost:11434",
+                "timeout": 30.0,
+                "max_tokens": 1000,
+            },
+            "log_level": "INFO",
+        }
 
-    def test_from_env_invalid_max_tokens(
-        self, monkeypatch: pytest.MonkeyPatch
+    @pytest.mark.parametrize(
+        "key,value,match",
+        [
+            ("MQTT_PORT", "not_a_number", "Invalid MQTT_PORT value"),
+            ("MQTT_QOS", "invalid", "Invalid MQTT_QOS value"),
+            ("OPENAI_TIMEOUT", "not_a_float", "Invalid OPENAI_TIMEOUT value"),
+            (
+                "OPENAI_MAX_TOKENS",
+                "not_an_int",
+                "Invalid OPENAI_MAX_TOKENS value",
+            ),
+        ],
+    )
+    def test_from_env_invalid_number(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        key: str,
+        value: str,
+        match: str,
     ) -> None:
-        """Test error handling for invalid max tokens."""
-        monkeypatch.setenv("OPENAI_MAX_TOKENS", "not_an_int")
+        """Test error handling for unparseable numeric variables."""
+        monkeypatch.setenv(key, value)
 
-        with pytest.raises(
-            ValueError, match="Invalid OPENAI_MAX_TOKENS value"
-        ):
+        with pytest.raises(ValueError, match=match):
             AppConfig.from_env()
 
-    def test_retain_boolean_parsing(
-        self, monkeypatch: pytest.MonkeyPatch
-    ) -> None:
-        """Test MQTT retain boolean parsing variations."""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "env_value,expected",
+        [
             ("true", True),
             ("TRUE", True),
             ("1", True),
             ("yes", True),
             ("on", True),
+            ("t", True),
+            (" y ", True),
             ("false", False),
             ("FALSE", False),
             ("0", False),
             ("no", False),
             ("off", False),
             ("anything_else", False),
-        ]
+        ],
+    )
+    def test_retain_boolean_parsing(
+        self, monkeypatch: pytest.MonkeyPatch, env_value: str, expected: bool
+    ) -> None:
+        """Test MQTT retain boolean parsing variations."""
+        monkeypatch.setenv("MQTT_RETAIN", env_value)
+        config = AppConfig.from_env()
+        assert config.mqtt.retain is expected
 
-        for env_value, expected in test_cases:
-            monkeypatch.setenv("MQTT_RETAIN", env_value)
-            config = AppConfig.from_env()
-            assert config.mqtt.retain is expected
+    def test_from_env_generates_client_id_per_call(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test each from_env call gets its own client ID and environment."""
+        monkeypatch.delenv("MQTT_CLIENT_ID", raising=False)
+        monkeypatch.setenv("MQTT_BROKER", "first.mqtt.com")
+        config = AppConfig.from_env()
+        again = AppConfig.from_env()
+        assert again.mqtt.client_id != config.mqtt.client_id
+
+        monkeypatch.setenv("MQTT_BROKER", "second.mqtt.com")
+        assert AppConfig.from_env().mqtt.broker == "second.mqtt.com"
 
 
 class TestConfigValidation:
     """Test configuration validation methods."""
 
-    def test_validate_config_success(self) -> None:
+    def test_validate_config_success(self, app_config: AppConfig) -> None:
         """Test successful configuration validation."""
-        from mqtt_llm.config import MQTTConfig, OpenAIConfig
-
-        mqtt_config = MQTTConfig(
-            broker="test.mqtt.com",
-            subscribe_topic="input/test",
-            publish_topic="output/test",
-        )
-        openai_config = OpenAIConfig(model="test-model")
-        config = AppConfig(mqtt=mqtt_config, openai=openai_config)
-
         # Should not raise any exception
-        config.validate_config()
+        app_config.validate_config()
 
     def test_validate_config_missing_broker(self) -> None:
         """Test validation fails with missing MQTT broker."""
-        from mqtt_llm.config import MQTTConfig, OpenAIConfig
-
         mqtt_config = MQTTConfig(
             broker="",  # Empty broker
             subscribe_topic="input/test",
@@ -187,8 +242,6 @@ class TestConfigValidation:
 
     def test_validate_config_invalid_qos(self) -> None:
         """Test validation fails with invalid QoS during creation."""
-        from mqtt_llm.config import MQTTConfig, OpenAIConfig
-
         # Test that Pydantic validation catches invalid QoS at creation time
         with pytest.raises(
             ValidationError, match="Input should be less than or equal to 2"
@@ -202,8 +255,6 @@ class TestConfigValidation:
 
     def test_validate_config_missing_model(self) -> None:
         """Test validation fails with missing model name."""
-        from mqtt_llm.config import MQTTConfig, OpenAIConfig
-
         mqtt_config = MQTTConfig(
             broker="test.mqtt.com",
             subscribe_topic="input/test",
@@ -217,8 +268,6 @@ class TestConfigValidation:
 
     def test_get_summary(self) -> None:
         """Test configuration summary generation."""
-        from mqtt_llm.config import MQTTConfig, OpenAIConfig
-
         mqtt_config = MQTTConfig(
             broker="test.mqtt.com",
             port=1883,
@@ -239,21 +288,7 @@ class TestConfigValidation:
 
         summary = config.get_summary()
 
-        expected_keys = {
-            "mqtt_broker",
-            "mqtt_subscribe_topic",
-            "mqtt_publish_topic",
-            "mqtt_qos",
-            "mqtt_retain",
-            "mqtt_trigger_pattern",
-            "openai_api_url",
-            "openai_model",
-            "openai_timeout",
-            "openai_max_tokens",
-            "log_level",
-        }
-
-        assert set(summary.keys()) == expected_keys
+        assert summary.keys() == _SUMMARY_EXPECTED_KEYS
         assert summary["mqtt_broker"] == "test.mqtt.com:1883"
         assert summary["mqtt_subscribe_topic"] == "input/test"
         assert summary["mqtt_publish_topic"] == "output/test"
@@ -265,3 +300,17 @@ class TestConfigValidation:
         assert summary["openai_timeout"] == 45.0
         assert summary["openai_max_tokens"] == 500
         assert summary["log_level"] == "DEBUG"
+
+    def test_get_summary_returns_copy(self, app_config: AppConfig) -> None:
+        """Test changing a returned summary does not affect later ones."""
+        app_config.get_summary()["mqtt_broker"] = "changed"
+        assert app_config.get_summary()["mqtt_broker"] == (
+            "test.mqtt.com:1883"
+        )
+
+        copied = app_config.model_copy(update={"log_level": "DEBUG"})
+        assert copied.get_summary()["log_level"] == "DEBUG"
+
+        # Nothing unpicklable is left on the config after a summary
+        assert pickle.loads(pickle.dumps(app_config)) == app_config
+        assert copy.deepcopy(app_config) == app_config
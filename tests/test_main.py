@@ -0,0 +1,16 @@
+"""Tests for the command-line entry point."""
+
+import subprocess
+import sys
+
+
+def test_module_help_uses_program_name() -> None:
+    """Test python -m mqtt_llm reports itself as mqtt-llm."""
+    result = subprocess.run(
+        [sys.executable, "-m", "mqtt_llm", "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.startswith("Usage: mqtt-llm [OPTIONS]")
@@ -0,0 +1,173 @@
+"""Tests for MQTT client message handling and publishing."""
+
+import asyncio
+import json
+from typing import List
+from unittest.mock import Mock
+
+import pytest
+
+from mqtt_llm import jsonutil
+from mqtt_llm.config import MQTTConfig
+from mqtt_llm.mqtt_client import MQTTClient
+
+
+def test_publish_fragment_is_unaltered() -> None:
+    """Test stream fragments skip sanitizing, templating and chunking."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        publish_template='{"response": "{response}"}',
+        message_max_length=20,
+        sanitize_response=True,
+    )
+    client = MQTTClient(config)
+    client.connected = True
+
+    mock_mqtt_client = Mock()
+    mock_mqtt_client.publish.return_value.rc = 0  # Success
+    client.client = mock_mqtt_client
+
+    fragments = ["Hello ", "**world**, ", " ", "this fragment runs long\n"]
+    for fragment in fragments:
+        client.publish_fragment(fragment)
+
+    published = [c[0][1] for c in mock_mqtt_client.publish.call_args_list]
+    assert published == fragments
+
+
+def test_sanitize_response_folds_unicode() -> None:
+    """Test compatibility characters fold to ASCII and emoji are removed."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        sanitize_response=True,
+    )
+    client = MQTTClient(config)
+
+    assert client._sanitize_response("ﬁne") == "fine"
+    assert client._sanitize_response("Ｈｉ ⓐ") == "Hi a"
+    assert client._sanitize_response("5㎏　café") == "5kg cafe"
+    assert client._sanitize_response("Done 👍 **now**") == "Done now"
+
+
+def test_extract_text_content_payloads() -> None:
+    """Test text extraction for raw, JSON, scalar and non-UTF-8 payloads."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+    )
+    client = MQTTClient(config)
+
+    assert client._extract_text_content(b' \n{"text": "hi @ai"}') == "hi @ai"
+    # JSON scalars have no "text" key, so they are dropped
+    assert client._extract_text_content(b'"hello @ai"') is None
+    assert client._extract_text_content(b"42") is None
+    # Text that only looks like the start of JSON is still plain text
+    assert client._extract_text_content(b"tell me @ai") == "tell me @ai"
+    assert client._extract_text_content(b"caf\xe9 @ai") == "caf� @ai"
+
+    client = MQTTClient(
+        MQTTConfig(
+            broker="test",
+            subscribe_topic="test/input",
+            publish_topic="test/output",
+            subscribe_path="$",
+        )
+    )
+    payload = b'{"text": "hi", "user": "me"}'
+    assert client._extract_text_content(payload) == payload.decode()
+
+    client = MQTTClient(
+        MQTTConfig(
+            broker="test",
+            subscribe_topic="test/input",
+            publish_topic="test/output",
+            subscribe_path="$.message",
+        )
+    )
+    assert client._extract_text_content(b'"hello @ai"') is None
+
+
+def test_on_message_without_loop_runs_inline() -> None:
+    """Test messages go straight to a sync handler when no loop is set."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+    )
+    client = MQTTClient(config)
+    received: List[str] = []
+    client.set_message_handler(received.append)
+
+    client._on_message(Mock(), None, Mock(payload=b'{"text": "hi @ai"}'))
+    client._on_message(Mock(), None, Mock(payload=b'{"text": "no trigger"}'))
+
+    assert received == ["hi @ai"]
+
+
+def test_on_message_runs_coroutine_handlers_concurrently() -> None:
+    """Test each message gets its own handler task on the event loop."""
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+    )
+    client = MQTTClient(config)
+    started: List[str] = []
+    release = asyncio.Event()
+
+    async def handler(text: str) -> None:
+        started.append(text)
+        await release.wait()
+
+    async def scenario() -> None:
+        client._loop = asyncio.get_running_loop()
+        client.set_async_message_handler(handler)
+        for text in ("one @ai", "two @ai"):
+            payload = f'{{"text": "{text}"}}'.encode()
+            client._on_message(Mock(), None, Mock(payload=payload))
+        await asyncio.sleep(0.01)
+        # Both handlers are running even though neither has finished
+        assert started == ["one @ai", "two @ai"]
+        release.set()
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(
+    "use_orjson",
+    [
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not jsonutil.HAS_ORJSON, reason="orjson not installed"
+            ),
+        ),
+        False,
+    ],
+)
+def test_json_template_output_matches_stdlib(
+    monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    """Test JSON template bytes do not depend on orjson being installed."""
+    monkeypatch.setattr(jsonutil, "HAS_ORJSON", use_orjson)
+    config = MQTTConfig(
+        broker="test",
+        subscribe_topic="test/input",
+        publish_topic="test/output",
+        publish_template={"text": "{response}", "n": 1},
+    )
+    client = MQTTClient(config)
+
+    response = 'café "x"'
+    assert client._format_response(response) == json.dumps(
+        {"text": response, "n": 1}
+    )
+    assert client._format_response(response) == (
+        '{"text": "caf\\u00e9 \\"x\\"", "n": 1}'
+    )
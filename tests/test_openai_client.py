@@ -0,0 +1,225 @@
+"""Tests for the OpenAI-compatible API client."""
+
+import asyncio
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
+
+import aiohttp
+import pytest
+
+from mqtt_llm import openai_client
+from mqtt_llm.config import OpenAIConfig
+from mqtt_llm.openai_client import OpenAIClient, OpenAIError, _sse_deltas
+
+
+class _StubResponse:
+    """Canned aiohttp response usable as an async context manager."""
+
+    def __init__(
+        self,
+        status: int = 200,
+        body: bytes = b"{}",
+        headers: Optional[dict] = None,
+    ) -> None:
+        """Store the canned status, body and headers."""
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self) -> "_StubResponse":
+        """Return the response itself."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Release nothing."""
+
+    async def read(self) -> bytes:
+        """Return the body bytes."""
+        return self.body
+
+    async def text(self) -> str:
+        """Return the body as text."""
+        return self.body.decode()
+
+
+class _StubSession:
+    """Session that replays canned responses and records requests."""
+
+    closed = False
+
+    def __init__(
+        self, *responses: Union[_StubResponse, BaseException]
+    ) -> None:
+        """Queue responses (or exceptions to raise) in request order."""
+        self.responses = list(responses)
+        self.requests: List[Tuple[str, str, dict]] = []
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> Any:
+        self.requests.append((method, url, kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def head(self, url: str, **kwargs: Any) -> Any:
+        """Record a HEAD request."""
+        return self._request("HEAD", url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        """Record a GET request."""
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        """Record a POST request."""
+        return self._request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """Close nothing."""
+
+
+def _client(session: _StubSession, **config: Any) -> OpenAIClient:
+    """Return a client whose HTTP session is the given stub."""
+    client = OpenAIClient(OpenAIConfig(model="test-model", **config))
+    client.session = session  # type: ignore[assignment]
+    return client
+
+
+def test_warm_up_ignores_failures() -> None:
+    """Test connection warm-up sends HEAD requests and swallows errors."""
+    session = _StubSession(
+        _StubResponse(), aiohttp.ClientConnectionError("refused")
+    )
+    client = _client(session)
+
+    asyncio.run(client.warm_up())
+
+    assert [(method, url) for method, url, _ in session.requests] == [
+        ("HEAD", "http://localhost:11434"),
+        ("HEAD", "http://localhost:11434"),
+    ]
+
+
+def test_sse_deltas_parses_stream() -> None:
+    """Test streamed deltas are read from data lines until [DONE]."""
+    lines = [
+        b": keep-alive\n",
+        b'data: {"choices": [{"delta": {"role": "assistant"}}]}\n',
+        b'data: {"choices": [{"delta": {"content": "Hello"}}]}\n',
+        b"\n",
+        b'data:{"choices": [{"delta": {"content": " "}}]}\n',
+        b'data: {"choices": [{"delta": {"content": "world"}}]}\n',
+        b'data: {"choices": []}\n',
+        b"data: [DONE]\n",
+        b'data: {"choices": [{"delta": {"content": "ignored"}}]}\n',
+    ]
+
+    async def body() -> AsyncIterator[bytes]:
+        for line in lines:
+            yield line
+
+    async def collect() -> List[str]:
+        return [delta async for delta in _sse_deltas(body())]
+
+    assert asyncio.run(collect()) == ["Hello", " ", "world"]
+
+
+@pytest.mark.parametrize(
+    "outcome,match,cause",
+    [
+        (
+            _StubResponse(500, b"boom"),
+            "OpenAI API request failed with status 500: boom",
+            None,
+        ),
+        (
+            aiohttp.ClientConnectionError("refused"),
+            "Failed to connect to OpenAI API: refused",
+            aiohttp.ClientConnectionError,
+        ),
+        (
+            asyncio.TimeoutError(),
+            "OpenAI API request timed out after 30.0s",
+            asyncio.TimeoutError,
+        ),
+        (
+            _StubResponse(200, b"not json"),
+            "Invalid JSON response from OpenAI API",
+            ValueError,
+        ),
+    ],
+)
+def test_generate_response_wraps_errors(
+    outcome: Union[_StubResponse, BaseException],
+    match: str,
+    cause: Optional[type],
+) -> None:
+    """Test request failures surface as OpenAIError chained to the cause."""
+    client = _client(_StubSession(outcome))
+
+    with pytest.raises(OpenAIError, match=match) as excinfo:
+        asyncio.run(client.generate_response("hi"))
+
+    if cause is None:
+        assert excinfo.value.__cause__ is None
+    else:
+        assert isinstance(excinfo.value.__cause__, cause)
+
+
+def test_chat_response_error_names_chat_api() -> None:
+    """Test chat request failures name the chat API."""
+    client = _client(_StubSession(_StubResponse(503, b"busy")))
+
+    with pytest.raises(
+        OpenAIError, match="OpenAI chat API request failed with status 503"
+    ):
+        asyncio.run(client.chat_response([{"role": "user", "content": "hi"}]))
+
+
+def test_stream_and_list_models_wrap_timeouts() -> None:
+    """Test timeouts in streaming and model listing raise OpenAIError."""
+    client = _client(
+        _StubSession(asyncio.TimeoutError(), asyncio.TimeoutError())
+    )
+
+    async def stream() -> None:
+        async for _ in client.generate_response_stream("hi"):
+            pass
+
+    with pytest.raises(OpenAIError, match="timed out"):
+        asyncio.run(stream())
+    with pytest.raises(OpenAIError, match="timed out"):
+        asyncio.run(client.list_models())
+
+
+def test_model_list_revalidation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the model list is cached, then revalidated with its ETag."""
+    models = [{"id": "test-model"}]
+    session = _StubSession(
+        _StubResponse(
+            200,
+            b'{"data": [{"id": "test-model"}]}',
+            {"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 00:00:00"},
+        ),
+        _StubResponse(304, b""),
+    )
+    client = _client(session)
+
+    assert asyncio.run(client.health_check())
+    # Within the TTL the list is served without a request
+    assert asyncio.run(client.list_models()) == models
+    assert len(session.requests) == 1
+    assert session.requests[0][2]["headers"] == {}
+
+    # Once it expires, an unchanged list comes back as 304 and is reused
+    monkeypatch.setattr(openai_client, "MODELS_CACHE_TTL", 0.0)
+    assert asyncio.run(client.list_models()) == models
+    assert session.requests[1][2]["headers"] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 05 Oct 2026 00:00:00",
+    }
+
+
+def test_health_check_304_without_cache_fails() -> None:
+    """Test a 304 is only trusted when there is a cached list to reuse."""
+    client = _client(_StubSession(_StubResponse(304, b"")))
+
+    assert not asyncio.run(client.health_check())
@@ -0,0 +1,44 @@
+"""Tests for the API response cache."""
+
+import pytest
+
+from mqtt_llm import cache
+from mqtt_llm.cache import ResponseCache
+
+
+def test_cache_hit_and_miss() -> None:
+    """Test cached responses are returned only for the same prompt."""
+    response_cache = ResponseCache(max_entries=2, ttl=60.0)
+    response_cache.put("hello @ai", "Hi there")
+
+    assert response_cache.get("hello @ai") == "Hi there"
+    assert response_cache.get("goodbye @ai") is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test the least recently used response is evicted when full."""
+    response_cache = ResponseCache(max_entries=2, ttl=60.0)
+    response_cache.put("first", "1")
+    response_cache.put("second", "2")
+    response_cache.get("first")
+    response_cache.put("third", "3")
+
+    assert len(response_cache) == 2
+    assert response_cache.get("second") is None
+    assert response_cache.get("first") == "1"
+    assert response_cache.get("third") == "3"
+
+
+def test_cache_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test responses are not reused after the TTL has passed."""
+    now = 1000.0
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    response_cache = ResponseCache(max_entries=2, ttl=30.0)
+    response_cache.put("hello @ai", "Hi there")
+
+    now = 1029.0
+    assert response_cache.get("hello @ai") == "Hi there"
+
+    now = 1030.0
+    assert response_cache.get("hello @ai") is None
+    assert len(response_cache) == 0